@@ -3,7 +3,7 @@
 Defines a helper function for pagination.
 """
 
-from typing import Tuple
+from typing import Iterable, List, Tuple
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -21,3 +21,18 @@ def index_range(page: int, page_size: int) -> Tuple[int, int]:
     start_index = (page - 1) * page_size
     end_index = start_index + page_size
     return start_index, end_index
+
+
+def index_ranges(pages: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Returns the (start_index, end_index) tuple of every (page, page_size)
+    pair, as index_range would one at a time, in a single pass.
+
+    Args:
+        pages (Iterable[Tuple[int, int]]): The (page, page_size) pairs.
+
+    Returns:
+        List[Tuple[int, int]]: A (start_index, end_index) tuple per pair.
+    """
+    return [((page - 1) * page_size, page * page_size)
+            for page, page_size in pages]
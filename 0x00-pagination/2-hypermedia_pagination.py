@@ -4,9 +4,18 @@ Defines a Server class to paginate a database
 of popular baby names with hypermedia pagination.
 """
 
-import csv
 import math
-from typing import List, Tuple, Dict
+import threading
+from itertools import repeat
+from typing import Iterator, List, Optional, Sequence, Tuple, Dict
+
+from aggregate_views import AggregateViews
+from dataset_storage import load_dataset
+from dataset_tail import CSVTail, extend_dataset, start_watch
+from secondary_index import DatasetIndex
+from sort_orders import SortOrders
+
+index_ranges = __import__('0-simple_helper_function').index_ranges
 
 
 def index_range(page: int, page_size: int) -> Tuple[int, int]:
@@ -31,19 +40,90 @@ class Server:
     """
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, storage: str = "list", dedupe: bool = False):
+        """
+        Args:
+            storage (str): How the dataset is held, "list" of string
+                rows, "columnar" typed columns, "mmap" rows parsed
+                from the mapped file on demand, "snapshot" typed
+                columns mapped from a binary snapshot or "shared" typed
+                columns attached from shared memory (see
+                dataset_storage.load_dataset).
+            dedupe (bool): Whether to drop the rows repeating an
+                earlier row when loading.
+        """
         self.__dataset = None
+        self.__index = None
+        self.__orders = None
+        self.__views = None
+        self.__tail = None
+        self.storage = storage
+        self.dedupe = dedupe
 
     def dataset(self) -> List[List]:
         """Cached dataset"""
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Exclude header row
+            self.__dataset = load_dataset(self.DATA_FILE, self.storage,
+                                          self.dedupe)
         return self.__dataset
 
-    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+    def index(self) -> DatasetIndex:
+        """Cached secondary indexes of the dataset"""
+        if self.__index is None:
+            self.__index = DatasetIndex(self.dataset())
+        return self.__index
+
+    def orders(self) -> SortOrders:
+        """Cached sort orders of the dataset"""
+        if self.__orders is None:
+            self.__orders = SortOrders(self.dataset())
+        return self.__orders
+
+    def views(self) -> AggregateViews:
+        """Cached aggregate views of the dataset"""
+        if self.__views is None:
+            self.__views = AggregateViews(self.dataset()[:])
+        return self.__views
+
+    def refresh(self) -> int:
+        """
+        Appends the rows added to the data file since it was loaded,
+        parsing only them. get_hyper counts them in total_pages at
+        once and the aggregate views are updated; the secondary
+        indexes and sort orders are rebuilt when next used.
+
+        Returns:
+            int: The number of rows appended.
+
+        Raises:
+            ValueError: If the dataset is de-duplicated, or the file
+                was rewritten rather than appended to.
+        """
+        if self.dedupe:
+            raise ValueError("cannot follow a de-duplicated dataset")
+        dataset = self.dataset()
+        if self.__tail is None:
+            self.__tail = CSVTail(self.DATA_FILE, len(dataset))
+        rows = self.__tail.read()
+        if rows:
+            self.__dataset = extend_dataset(dataset, rows)
+            self.__index = None
+            self.__orders = None
+            if self.__views is not None:
+                for row in rows:
+                    self.__views.add(row)
+        return len(rows)
+
+    def watch(self, interval: float = 1.0,
+              lock: Optional[threading.Lock] = None) -> threading.Event:
+        """
+        Calls refresh every interval seconds in the background until
+        the returned event is set (see dataset_tail.start_watch).
+        """
+        return start_watch(self.refresh, interval, lock)
+
+    def get_page(self, page: int = 1, page_size: int = 10,
+                 order_by: Optional[str] = None) -> List[List]:
         """
         Returns a page of the dataset (list of rows) based on
         pagination parameters.
@@ -51,6 +131,9 @@ class Server:
         Args:
             page (int): The current page number (1-indexed).
             page_size (int): The number of items per page.
+            order_by (str): A column among year, name, count and rank
+                to sort by, descending if prefixed by "-" (e.g.
+                "-count"), or None for the file order.
 
         Returns:
             List[List]: A list of rows corresponding to the page, or
@@ -58,6 +141,7 @@ class Server:
 
         Raises:
             AssertionError: If page or page_size are not positive integers.
+            ValueError: If order_by is unknown.
         """
         # Validate inputs
         assert (
@@ -72,23 +156,209 @@ class Server:
 
         # Return the appropriate slice of the dataset
         dataset = self.dataset()
-        return dataset[start_index:end_index]
+        if order_by is None:
+            return dataset[start_index:end_index]
+        positions = self.orders().permutation(order_by)
+        return [dataset[i] for i in positions[start_index:end_index]]
+
+    def get_pages(self, pages: Sequence[Tuple[int, int]],
+                  order_by: Optional[str] = None) -> List[List[List]]:
+        """
+        Returns the pages of many (page, page_size) pairs at once, as
+        get_page would one at a time. Unless the dataset is a list,
+        whose rows are already built, their index ranges are sorted and
+        merged where they overlap or touch, so the storage is read in
+        one pass and builds each row at most once, however many pages
+        share it.
+
+        Args:
+            pages (Sequence[Tuple[int, int]]): The (page, page_size)
+                pairs, in any order.
+            order_by (str): The sort order of the rows (see get_page).
+
+        Returns:
+            List[List[List]]: The rows of each page, in the order of
+            pages, empty for the pages out of range.
+
+        Raises:
+            AssertionError: If a page or page_size is not a positive
+                integer.
+            ValueError: If order_by is unknown.
+        """
+        pages = list(pages)
+        numbers, sizes = zip(*pages) if pages else ((), ())
+        assert (
+            all(map(isinstance, numbers, repeat(int)))
+            and min(numbers, default=1) > 0
+        ), "page must be a positive integer"
+        assert (
+            all(map(isinstance, sizes, repeat(int)))
+            and min(sizes, default=1) > 0
+        ), "page_size must be a positive integer"
+
+        dataset = self.dataset()
+        ranges = index_ranges(pages)
+        positions = (None if order_by is None
+                     else self.orders().permutation(order_by))
+        if isinstance(dataset, list):
+            # Its rows are already built, so a page is cheapest cut
+            # straight out of it
+            if positions is None:
+                return [dataset[start:end] for start, end in ranges]
+            return [[dataset[i] for i in positions[start:end]]
+                    for start, end in ranges]
+        size = len(dataset)
+        ranges = [(min(start, size), min(end, size)) for start, end in ranges]
+        ordered = sorted(range(len(ranges)), key=ranges.__getitem__)
+
+        # Merges the sorted ranges into disjoint spans
+        spans: List[List[int]] = []
+        for i in ordered:
+            start, end = ranges[i]
+            if start == end:
+                continue
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+
+        if positions is None:
+            span_rows = [dataset[lo:hi] for lo, hi in spans]
+        else:
+            span_rows = [[dataset[i] for i in positions[lo:hi]]
+                         for lo, hi in spans]
 
-    def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict:
+        # Cuts every page out of its span, spans and ranges both sorted
+        result: List[List[List]] = [[] for _ in ranges]
+        span = 0
+        for i in ordered:
+            start, end = ranges[i]
+            if start == end:
+                continue
+            while spans[span][1] < end:
+                span += 1
+            lo = spans[span][0]
+            result[i] = span_rows[span][start - lo:end - lo]
+        return result
+
+    def get_hyper(self, page: int = 1, page_size: int = 10,
+                  order_by: Optional[str] = None,
+                  view: Optional[str] = None) -> Dict:
         """
         Returns a dictionary containing hypermedia pagination details.
 
         Args:
             page (int): The current page number (1-indexed).
             page_size (int): The number of items per page.
+            order_by (str): The sort order of the rows (see get_page).
+            view (str): An aggregate view to page through instead of
+                the rows, one of AggregateViews.VIEWS.
 
         Returns:
             Dict: A dictionary with hypermedia pagination details.
+
+        Raises:
+            ValueError: If view is unknown or combined with order_by.
         """
-        data = self.get_page(page, page_size)
+        if view is not None:
+            if order_by is not None:
+                raise ValueError("views have their own order")
+            return self.views().get_hyper(view, page, page_size)
+        data = self.get_page(page, page_size, order_by)
         total_items = len(self.dataset())
         total_pages = math.ceil(total_items / page_size)
 
+        hyper = {
+            "page_size": len(data),
+            "page": page,
+            "data": data,
+            "next_page": page + 1 if page < total_pages else None,
+            "prev_page": page - 1 if page > 1 else None,
+            "total_pages": total_pages,
+        }
+        if order_by is not None:
+            hyper["order_by"] = order_by
+        return hyper
+
+    def iter_pages(self, page_size: int = 1000, page: int = 1,
+                   order_by: Optional[str] = None) -> Iterator[List[List]]:
+        """
+        Yields the pages of get_page from page to the last one, one at a
+        time and without computing total_pages, so with a lazy storage
+        such as "mmap" only one page of rows is held at once.
+
+        Args:
+            page_size (int): The number of items per page.
+            page (int): The page to start from, to resume an export.
+            order_by (str): The sort order of the rows (see get_page).
+        """
+        while True:
+            data = self.get_page(page, page_size, order_by)
+            if not data:
+                return
+            yield data
+            page += 1
+
+    def iter_rows(self, page_size: int = 1000,
+                  order_by: Optional[str] = None) -> Iterator[List]:
+        """
+        Yields every row, page_size at a time (see iter_pages); feed it
+        to streaming.write_csv or write_ndjson.
+        """
+        for data in self.iter_pages(page_size, order_by=order_by):
+            yield from data
+
+    def get_filtered_page(self, page: int = 1, page_size: int = 10,
+                          **filters: str) -> List[List]:
+        """
+        Returns a page of the rows matching every filter, found through
+        the secondary indexes.
+
+        Args:
+            page (int): The current page number (1-indexed).
+            page_size (int): The number of items per page.
+            **filters (str): Any of year, gender, ethnicity, name
+                (case-insensitive) and prefix (of the name,
+                case-insensitive).
+
+        Returns:
+            List[List]: The matching rows of the page, or an empty
+            list if out of range.
+
+        Raises:
+            AssertionError: If page or page_size are not positive integers.
+            ValueError: If a filter is unknown.
+        """
+        assert (
+            isinstance(page, int) and page > 0
+        ), "page must be a positive integer"
+        assert (
+            isinstance(page_size, int) and page_size > 0
+        ), "page_size must be a positive integer"
+
+        start_index, end_index = index_range(page, page_size)
+        dataset = self.dataset()
+        positions = self.index().filter(**filters)[start_index:end_index]
+        return [dataset[i] for i in positions]
+
+    def get_filtered_hyper(self, page: int = 1, page_size: int = 10,
+                           **filters: str) -> Dict:
+        """
+        Returns a dictionary containing hypermedia pagination details
+        over the rows matching every filter (see get_filtered_page).
+
+        Args:
+            page (int): The current page number (1-indexed).
+            page_size (int): The number of items per page.
+            **filters (str): The filters the rows must match.
+
+        Returns:
+            Dict: A dictionary with hypermedia pagination details.
+        """
+        data = self.get_filtered_page(page, page_size, **filters)
+        total_items = len(self.index().filter(**filters))
+        total_pages = math.ceil(total_items / page_size)
+
         return {
             "page_size": len(data),
             "page": page,
@@ -96,4 +366,5 @@ class Server:
             "next_page": page + 1 if page < total_pages else None,
             "prev_page": page - 1 if page > 1 else None,
             "total_pages": total_pages,
+            "filters": filters,
         }
@@ -3,37 +3,156 @@
 Deletion-resilient hypermedia pagination
 """
 
-import csv
 import math
-from typing import List, Dict
+import threading
+from typing import List, Dict, Iterator, Optional
+
+from aggregate_views import AggregateViews
+from cursor import Cursor, decode_cursor, encode_cursor
+from dataset_snapshot import dataset_version, version_size
+from dataset_storage import load_dataset
+from dataset_tail import CSVTail, extend_dataset, start_watch
+from live_index import LiveIndex
 
 
 class Server:
     """Server class to paginate a database of popular baby names."""
     DATA_FILE = "Popular_Baby_Names.csv"
 
-    def __init__(self):
+    def __init__(self, storage: str = "list", dedupe: bool = False):
+        """
+        Args:
+            storage (str): How the dataset is held (see
+                dataset_storage.load_dataset).
+            dedupe (bool): Whether to drop the rows repeating an
+                earlier row when loading.
+        """
         self.__dataset = None
         self.__indexed_dataset = None
+        self.__version = None
+        # Versions of earlier prefixes of the data file, seen or checked
+        self.__prefixes = set()
+        self.__views = None
+        self.__tail = None
+        self.storage = storage
+        self.dedupe = dedupe
 
     def dataset(self) -> List[List]:
         """Cached dataset"""
         if self.__dataset is None:
-            with open(self.DATA_FILE) as f:
-                reader = csv.reader(f)
-                dataset = [row for row in reader]
-            self.__dataset = dataset[1:]  # Exclude header row
+            self.__dataset = load_dataset(self.DATA_FILE, self.storage,
+                                          self.dedupe)
         return self.__dataset
 
-    def indexed_dataset(self) -> Dict[int, List]:
+    def version(self) -> str:
+        """
+        Cached version of the data file, the same in every process.
+        De-duplication renumbers the positions, so it is part of the
+        version, and cursors never cross between the two layouts.
+        """
+        if self.__version is None:
+            self.__version = dataset_version(self.DATA_FILE)
+            if self.dedupe:
+                self.__version += ":dedupe"
+        return self.__version
+
+    def accepts(self, version: str) -> bool:
+        """
+        Whether positions handed out under version are valid here: it
+        is the current version, or that of an earlier prefix of the
+        data file, whose rows kept their positions as rows were
+        appended. Other prefixes are checked once against the file.
+        """
+        current = self.version()
+        if version == current or version in self.__prefixes:
+            return True
+        base, _, layout = version.partition(":")
+        current_base, _, current_layout = current.partition(":")
+        size = version_size(base)
+        if (layout != current_layout or size is None
+                or size >= version_size(current_base)):
+            return False
+        if dataset_version(self.DATA_FILE, size=size) != base:
+            return False
+        self.__prefixes.add(version)
+        return True
+
+    def indexed_dataset(self) -> LiveIndex:
         """Dataset indexed by sorting position, starting at 0"""
         if self.__indexed_dataset is None:
-            dataset = self.dataset()
-            self.__indexed_dataset = {
-                i: dataset[i] for i in range(len(dataset))
-            }
+            self.__indexed_dataset = LiveIndex(self.dataset())
         return self.__indexed_dataset
 
+    def views(self) -> AggregateViews:
+        """
+        Cached aggregate views of the live rows, paginated with their
+        get_hyper and kept up to date by delete.
+        """
+        if self.__views is None:
+            indexed_data = self.indexed_dataset()
+            positions, _ = indexed_data.next_live(0, len(indexed_data))
+            self.__views = AggregateViews(indexed_data.rows(positions))
+        return self.__views
+
+    def delete(self, index: int) -> None:
+        """
+        Deletes the row at index; the other rows keep their index.
+
+        Raises:
+            KeyError: If there is no row at index.
+        """
+        indexed_data = self.indexed_dataset()
+        row = indexed_data[index]
+        indexed_data.delete(index)
+        if self.__views is not None:
+            self.__views.remove(row)
+
+    def refresh(self) -> int:
+        """
+        Appends the rows added to the data file since it was loaded,
+        parsing only them, at new positions after the last one. No
+        other row moves, so every index and next_index handed out
+        stays valid; a next_index that was at the end now leads to
+        the new rows. The version becomes that of the grown file, as
+        computed by a process loading it, and cursors of the earlier
+        versions stay accepted (see accepts).
+
+        Returns:
+            int: The number of rows appended.
+
+        Raises:
+            ValueError: If the dataset is de-duplicated, or the file
+                was rewritten rather than appended to.
+        """
+        if self.dedupe:
+            raise ValueError("cannot follow a de-duplicated dataset")
+        indexed_data = self.indexed_dataset()
+        tail = self.__tail
+        if tail is None:
+            tail = self.__tail = CSVTail(self.DATA_FILE, len(self.dataset()))
+        rows = tail.read()
+        if rows:
+            self.__dataset = extend_dataset(self.__dataset, rows)
+        # The version of the rows loaded, even if the file had grown
+        # before it was first hashed
+        if self.__version != tail.version:
+            if self.__version is not None:
+                self.__prefixes.add(self.__version)
+            self.__version = tail.version
+        for row in rows:
+            indexed_data.insert(indexed_data.span, row)
+            if self.__views is not None:
+                self.__views.add(row)
+        return len(rows)
+
+    def watch(self, interval: float = 1.0,
+              lock: Optional[threading.Lock] = None) -> threading.Event:
+        """
+        Calls refresh every interval seconds in the background until
+        the returned event is set (see dataset_tail.start_watch).
+        """
+        return start_watch(self.refresh, interval, lock)
+
     def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
         """
         Returns a dictionary containing deletion-resilient hypermedia
@@ -50,22 +169,15 @@ class Server:
         Raises:
             AssertionError: If index is not a valid position in the dataset.
         """
+        indexed_data = self.indexed_dataset()
         assert (
             isinstance(index, int)
-            and 0 <= index < len(self.indexed_dataset())
+            and 0 <= index < indexed_data.span
         ), "Index out of range"
 
-        data = []
-        next_index = index
-        current_size = 0
-        indexed_data = self.indexed_dataset()
-
-        # Gather data until the page is filled or end of dataset
-        while current_size < page_size and next_index < len(indexed_data):
-            if next_index in indexed_data:
-                data.append(indexed_data[next_index])
-                current_size += 1
-            next_index += 1
+        # Skips deleted rows without walking them
+        positions, next_index = indexed_data.next_live(index, page_size)
+        data = indexed_data.rows(positions)
 
         return {
             "index": index,
@@ -73,3 +185,83 @@ class Server:
             "page_size": len(data),
             "next_index": next_index,
         }
+
+    def get_cursor(self, cursor: Optional[str] = None,
+                   page_size: int = 10) -> Dict:
+        """
+        Returns a page of rows following a continuation token, in
+        sorting position order. The token holds the position of the
+        last row served, so any page costs the same as the first, rows
+        deleted or inserted meanwhile never shift the next page, and
+        any process serving the same data file can resume it.
+
+        Args:
+            cursor (str): The next_cursor of the previous page, or None
+                for the first page.
+            page_size (int): The number of items per page.
+
+        Returns:
+            Dict: The cursor, data, page_size and next_cursor (None
+            after the last page).
+
+        Raises:
+            AssertionError: If page_size is not a positive integer.
+            ValueError: If cursor is invalid or was issued for another
+                version of the data.
+        """
+        assert (
+            isinstance(page_size, int) and page_size > 0
+        ), "page_size must be a positive integer"
+        start = 0
+        if cursor is not None:
+            last = decode_cursor(cursor)
+            if not self.accepts(last.version) or last.order != "position":
+                raise ValueError("cursor issued for another dataset")
+            start = last.position + 1
+
+        indexed_data = self.indexed_dataset()
+        positions, next_index = indexed_data.next_live(start, page_size)
+        data = indexed_data.rows(positions)
+
+        next_cursor = None
+        if positions and next_index < indexed_data.span:
+            next_cursor = encode_cursor(Cursor(
+                self.version(), "position", positions[-1], positions[-1]))
+        return {
+            "cursor": cursor,
+            "data": data,
+            "page_size": len(data),
+            "next_cursor": next_cursor,
+        }
+
+    def iter_pages(self, page_size: int = 1000,
+                   cursor: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yields the get_cursor pages from cursor to the end, one at a
+        time, so only one page of rows is held at once. An interrupted
+        export resumes from the next_cursor of the last page it got.
+
+        Args:
+            page_size (int): The number of items per page.
+            cursor (str): Where to start, None for the first row.
+
+        Raises:
+            AssertionError: If page_size is not a positive integer.
+            ValueError: If cursor is invalid (see get_cursor).
+        """
+        while True:
+            page = self.get_cursor(cursor, page_size)
+            if page["data"]:
+                yield page
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    def iter_rows(self, page_size: int = 1000,
+                  cursor: Optional[str] = None) -> Iterator[List]:
+        """
+        Yields every live row from cursor on, page_size at a time (see
+        iter_pages); feed it to streaming.write_csv or write_ndjson.
+        """
+        for page in self.iter_pages(page_size, cursor):
+            yield from page["data"]
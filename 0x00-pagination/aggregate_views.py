@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Defines aggregate views of the dataset, maintained as rows come and go.
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# The older years abbreviate some ethnicities
+ETHNICITIES = {
+    "ASIAN AND PACI": "ASIAN AND PACIFIC ISLANDER",
+    "BLACK NON HISP": "BLACK NON HISPANIC",
+    "WHITE NON HISP": "WHITE NON HISPANIC",
+}
+
+
+def ethnicity(value: str) -> str:
+    """
+    Returns the unabbreviated spelling of an ethnicity.
+    """
+    return ETHNICITIES.get(value, value)
+
+
+def group_keys(row: List) -> Tuple[str, str, str]:
+    """
+    Returns the name, year and ethnicity a row is counted under: names
+    title-cased and ethnicities unabbreviated, so every spelling of a
+    group adds up together.
+    """
+    return row[3].title(), str(row[0]), ethnicity(row[2])
+
+
+class RankedCounter:
+    """
+    Totals per key, also kept as a list of (-total, key) sorted by
+    descending total then key, updated by bisection on every change so
+    that any slice of the ranking is available without sorting.
+    """
+
+    def __init__(self, totals: Dict[str, int] = None):
+        self.totals = dict(totals or {})
+        self.ranking = sorted((-total, key)
+                              for key, total in self.totals.items())
+
+    def add(self, key: str, delta: int) -> None:
+        """
+        Adds delta to the total of key, dropping it once it reaches 0.
+        """
+        old = self.totals.get(key, 0)
+        new = old + delta
+        if old > 0:
+            del self.ranking[bisect_left(self.ranking, (-old, key))]
+        if new > 0:
+            self.totals[key] = new
+            insort(self.ranking, (-new, key))
+        else:
+            self.totals.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self.ranking)
+
+    def top(self, start: int, end: int) -> List[Tuple[str, int]]:
+        """
+        Returns the (key, total) pairs ranked from start to end.
+        """
+        return [(key, -total) for total, key in self.ranking[start:end]]
+
+
+class AggregateViews:
+    """
+    Totals of Count per name, per year and per ethnicity, and the top
+    names of each year and of each ethnicity, as lists of rows sorted
+    by descending total that can be paginated like the dataset.
+
+    Every aggregate is a RankedCounter, so add() and remove() cost a few
+    bisections and a page of a view is sliced out of its ranking
+    without sorting anything.
+    """
+    TOTALS = ("name", "year", "ethnicity")
+    TOPS = {"top_names_by_year": "year",
+            "top_names_by_ethnicity": "ethnicity"}
+    VIEWS = TOTALS + tuple(TOPS)
+
+    def __init__(self, rows: Iterable[List] = (), top: int = 10):
+        """
+        Args:
+            rows (Iterable[List]): The rows counted at first.
+            top (int): How many names each top list holds.
+        """
+        self.top = top
+        totals: Dict[str, Counter] = {column: Counter()
+                                      for column in self.TOTALS}
+        groups: Dict[str, Dict[str, Counter]] = {"year": {}, "ethnicity": {}}
+        for row in rows:
+            count = int(row[4])
+            name, year, ethnicity = group_keys(row)
+            totals["name"][name] += count
+            for column, key in (("year", year), ("ethnicity", ethnicity)):
+                totals[column][key] += count
+                groups[column].setdefault(key, Counter())[name] += count
+        self.totals = {column: RankedCounter(counter)
+                       for column, counter in totals.items()}
+        # Count per name within each year and each ethnicity
+        self.groups = {column: {key: RankedCounter(counter)
+                                for key, counter in by_key.items()}
+                       for column, by_key in groups.items()}
+
+    def _update(self, row: List, sign: int) -> None:
+        """
+        Adds or subtracts the Count of row in every aggregate.
+        """
+        count = sign * int(row[4])
+        name, year, ethnicity = group_keys(row)
+        self.totals["name"].add(name, count)
+        for column, key in (("year", year), ("ethnicity", ethnicity)):
+            self.totals[column].add(key, count)
+            groups = self.groups[column]
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = RankedCounter()
+            group.add(name, count)
+            if not group:
+                del groups[key]
+
+    def add(self, row: List) -> None:
+        """
+        Counts a row in.
+        """
+        self._update(row, 1)
+
+    def remove(self, row: List) -> None:
+        """
+        Counts a previously added row out.
+        """
+        self._update(row, -1)
+
+    def _tops(self, column: str) -> List[List]:
+        """
+        Returns the top rows [group, rank, name, total] of every group.
+        """
+        groups = self.groups[column]
+        return [[key, rank, name, total]
+                for key in sorted(groups)
+                for rank, (name, total) in enumerate(
+                    groups[key].top(0, self.top), 1)]
+
+    def rows(self, name: str, start: int = 0,
+             end: int = None) -> List[List]:
+        """
+        Returns the rows of a view from start to end (excluded):
+        [key, total] for the totals per name, year or ethnicity,
+        [group, rank, name, total] for the top names by year or by
+        ethnicity.
+
+        Raises:
+            ValueError: If name is not a view.
+        """
+        if name in self.TOTALS:
+            totals = self.totals[name]
+            end = len(totals) if end is None else end
+            return [[key, total] for key, total in totals.top(start, end)]
+        if name in self.TOPS:
+            return self._tops(self.TOPS[name])[start:end]
+        raise ValueError("unknown view: {}".format(name))
+
+    def size(self, name: str) -> int:
+        """
+        Returns the number of rows of a view.
+
+        Raises:
+            ValueError: If name is not a view.
+        """
+        if name in self.TOTALS:
+            return len(self.totals[name])
+        if name in self.TOPS:
+            return sum(min(len(group), self.top)
+                       for group in self.groups[self.TOPS[name]].values())
+        raise ValueError("unknown view: {}".format(name))
+
+    def get_hyper(self, name: str, page: int = 1,
+                  page_size: int = 10) -> Dict:
+        """
+        Returns a dictionary containing hypermedia pagination details
+        over the rows of a view.
+
+        Raises:
+            AssertionError: If page or page_size are not positive integers.
+            ValueError: If name is not a view.
+        """
+        assert (
+            isinstance(page, int) and page > 0
+        ), "page must be a positive integer"
+        assert (
+            isinstance(page_size, int) and page_size > 0
+        ), "page_size must be a positive integer"
+
+        data = self.rows(name, (page - 1) * page_size, page * page_size)
+        total_pages = math.ceil(self.size(name) / page_size)
+        return {
+            "page_size": len(data),
+            "page": page,
+            "data": data,
+            "next_page": page + 1 if page < total_pages else None,
+            "prev_page": page - 1 if page > 1 else None,
+            "total_pages": total_pages,
+            "view": name,
+        }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Defines an asyncio front end serving the pagination Servers to many
+concurrent clients.
+"""
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+
+class AsyncServer:
+    """
+    Serves get_hyper and get_hyper_index of a wrapped Server without
+    blocking the event loop: every call runs in an executor, which also
+    does the file I/O of the first load.
+
+    Results are kept in a bounded LRU cache of futures, so concurrent
+    requests for the same page share one computation. After serving a
+    page, the following page is computed in the background, so a client
+    reading sequentially finds it ready. Cached pages are shared between
+    clients and must be treated as read-only.
+    """
+
+    def __init__(self, server, executor: Optional[Executor] = None,
+                 cache_size: int = 256, prefetch: bool = True):
+        """
+        Args:
+            server: A Server with get_hyper and/or get_hyper_index.
+            executor (Executor): Where Server calls run. Defaults to a
+                single thread of our own, since Servers build their
+                caches lazily and are not thread-safe.
+            cache_size (int): The most pages kept, in flight or done.
+            prefetch (bool): Whether to compute the following page of
+                every page served.
+        """
+        self.server = server
+        self.own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pagination")
+        self.cache_size = cache_size
+        self.prefetch = prefetch
+        self.cache: "OrderedDict[Tuple, asyncio.Future]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+
+    def _start(self, key: Tuple) -> asyncio.Future:
+        """
+        Returns the future of key, starting the Server call if needed.
+        """
+        future = self.cache.get(key)
+        if future is not None:
+            self.cache.move_to_end(key)
+            return future
+        name, *args = key
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.executor, getattr(self.server, name), *args)
+        future.add_done_callback(lambda done: self._settle(key, done))
+        self.cache[key] = future
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return future
+
+    def _settle(self, key: Tuple, future: asyncio.Future) -> None:
+        """
+        Forgets a failed call, so the next request retries it.
+        """
+        if future.cancelled() or future.exception() is not None:
+            if self.cache.get(key) is future:
+                del self.cache[key]
+
+    async def _get(self, key: Tuple, next_key) -> Dict:
+        """
+        Awaits the page of key, then prefetches next_key(page), if any.
+        """
+        if key in self.cache:
+            self.hits += 1
+        else:
+            self.misses += 1
+        # A client giving up must not cancel the page for the others
+        page = await asyncio.shield(self._start(key))
+        following = next_key(page) if self.prefetch else None
+        if following is not None and following not in self.cache:
+            self.prefetches += 1
+            self._start(following)
+        return page
+
+    async def get_hyper(self, page: int = 1, page_size: int = 10) -> Dict:
+        """
+        Returns server.get_hyper(page, page_size).
+        """
+        return await self._get(
+            ("get_hyper", page, page_size),
+            lambda hyper: (None if hyper["next_page"] is None else
+                           ("get_hyper", hyper["next_page"], page_size)))
+
+    async def get_hyper_index(self, index: int = None,
+                              page_size: int = 10) -> Dict:
+        """
+        Returns server.get_hyper_index(index, page_size).
+        """
+        return await self._get(
+            ("get_hyper_index", index, page_size),
+            lambda hyper: (None if hyper["page_size"] < page_size else
+                           ("get_hyper_index", hyper["next_index"],
+                            page_size)))
+
+    async def delete(self, index: int) -> None:
+        """
+        Runs server.delete(index), then drops the cached
+        get_hyper_index pages it may have changed.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.server.delete, index)
+        for key in [key for key in self.cache
+                    if key[0] == "get_hyper_index"]:
+            del self.cache[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hits, misses and prefetches so far.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "prefetches": self.prefetches}
+
+    def close(self) -> None:
+        """
+        Shuts down the executor if it was created here.
+        """
+        if self.own_executor:
+            self.executor.shutdown(wait=True)
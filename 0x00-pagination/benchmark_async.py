@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Latency seen by concurrent sequential readers of the AsyncServer, with
+and without prefetching the following page.
+
+Usage: ./benchmark_async.py [clients] [pages] [page_size] [think_ms]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from statistics import mean
+
+from async_server import AsyncServer
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+async def reader(service: AsyncServer, method: str, start: int, pages: int,
+                 page_size: int, think: float, first: list, rest: list):
+    """
+    Reads pages following pages from start, pausing think seconds
+    between them as a client rendering each page would.
+    """
+    position = start
+    for i in range(pages):
+        began = time.perf_counter()
+        hyper = await getattr(service, method)(position, page_size)
+        (rest if i else first).append(time.perf_counter() - began)
+        position = hyper.get("next_page", hyper.get("next_index"))
+        if position is None:
+            return
+        await asyncio.sleep(think)
+
+
+async def run(server, method: str, prefetch: bool, clients: int,
+              pages: int, page_size: int, think: float) -> tuple:
+    """
+    Runs clients readers at random starts against a fresh AsyncServer.
+    """
+    service = AsyncServer(server, prefetch=prefetch)
+    await getattr(service, method)(1 if method == "get_hyper" else 0, 1)
+    rng = random.Random(0)
+    total = len(server.dataset()) // page_size - pages
+    first, rest = [], []
+    began = time.perf_counter()
+    await asyncio.gather(*(
+        reader(service, method,
+               rng.randrange(1, total) * (1 if method == "get_hyper"
+                                          else page_size),
+               pages, page_size, think, first, rest)
+        for _ in range(clients)))
+    elapsed = time.perf_counter() - began
+    service.close()
+    return mean(first), mean(rest), clients * pages / elapsed
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    page_size = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    think = (float(sys.argv[4]) if len(sys.argv) > 4 else 20) / 1e3
+    print("{:>16} {:>9} {:>15} {:>14} {:>11}".format(
+        "method", "prefetch", "first page ms", "next pages ms", "pages/s"))
+    for method, make in (("get_hyper", Server),
+                         ("get_hyper_index", DelServer)):
+        for prefetch in (False, True):
+            first, rest, rate = asyncio.run(run(
+                make("mmap"), method, prefetch, clients, pages, page_size,
+                think))
+            print("{:>16} {:>9} {:>15.2f} {:>14.2f} {:>11.0f}".format(
+                method, str(prefetch), first * 1e3, rest * 1e3, rate))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Fetching many pages with one get_pages call against calling get_page
+once per page.
+
+Usage: ./benchmark_bulk_pages.py [repeat]
+"""
+
+import random
+import sys
+import time
+
+Server = __import__('2-hypermedia_pagination').Server
+STORAGES = ("list", "columnar", "snapshot", "mmap")
+
+
+def batches() -> dict:
+    """
+    The (page, page_size) pairs of each workload.
+    """
+    rng = random.Random(0)
+    return {
+        # A client prefetching the first pages of a listing
+        "pages 1-50": [(page, 10) for page in range(1, 51)],
+        # Many clients reading around the same pages, with their sizes
+        "overlapping": [(rng.randrange(1, 20), rng.choice((10, 20, 25)))
+                        for _ in range(50)],
+        "scattered": [(rng.randrange(1, 190), 100) for _ in range(50)],
+    }
+
+
+def timed_us(call, repeat: int) -> float:
+    """
+    Mean microseconds of call() over repeat calls.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print("{:>9} {:>12} {:>9} {:>12} {:>12} {:>8}".format(
+        "storage", "pages", "order_by", "loop us", "batch us", "speedup"))
+    for storage in STORAGES:
+        server = Server(storage)
+        server.dataset()
+        server.orders().permutation("-count")
+        for name, pages in batches().items():
+            for order_by in (None, "-count"):
+                loop = timed_us(lambda: [
+                    server.get_page(page, page_size, order_by)
+                    for page, page_size in pages], repeat)
+                batch = timed_us(
+                    lambda: server.get_pages(pages, order_by), repeat)
+                print("{:>9} {:>12} {:>9} {:>12.0f} {:>12.0f} {:>7.1f}x"
+                      .format(storage, name, order_by or "-", loop, batch,
+                              loop / batch))
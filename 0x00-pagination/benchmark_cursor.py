@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Cost of a page at increasing depths: offset pages of the hypermedia
+Server against resuming a cursor of the deletion-resilient Server.
+
+Usage: ./benchmark_cursor.py [requests] [page_size]
+"""
+
+import sys
+import time
+
+from cursor import Cursor, encode_cursor
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def per_call_us(call, requests: int) -> float:
+    """
+    Mean microseconds of call() over requests calls.
+    """
+    start = time.perf_counter()
+    for _ in range(requests):
+        call()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    offsets = Server()
+    cursors = DelServer()
+    total = len(offsets.dataset())
+    version = cursors.version()
+    print("{:>8} {:>14} {:>14}".format("row", "get_hyper us", "cursor us"))
+    for row in (0, total // 100, total // 10, total // 2, total - page_size):
+        page = row // page_size + 1
+        token = encode_cursor(Cursor(version, "position", row - 1, row - 1))
+        token = token if row else None
+        print("{:>8} {:>14.1f} {:>14.1f}".format(
+            row,
+            per_call_us(lambda: offsets.get_hyper(page, page_size), requests),
+            per_call_us(lambda: cursors.get_cursor(token, page_size),
+                        requests)))
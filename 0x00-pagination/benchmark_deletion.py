@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Deletion-resilient pagination under heavy deletion: the original
+{i: row} dict walked index by index against LiveIndex.
+
+Usage: ./benchmark_deletion.py [copies] [requests] [page_size]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+from dataset_storage import load_dataset
+from live_index import LiveIndex
+
+Server = __import__('3-hypermedia_del_pagination').Server
+RATIOS = (0.0, 0.5, 0.9, 0.99)
+
+
+def dict_hyper_index(indexed: Dict[int, List], span: int, index: int,
+                     page_size: int) -> List[List]:
+    """
+    The original get_hyper_index loop, bounded by span.
+    """
+    data = []
+    next_index = index
+    while len(data) < page_size and next_index < span:
+        if next_index in indexed:
+            data.append(indexed[next_index])
+        next_index += 1
+    return data
+
+
+def live_hyper_index(indexed: LiveIndex, index: int,
+                     page_size: int) -> List[List]:
+    """
+    The LiveIndex get_hyper_index lookup.
+    """
+    positions, _ = indexed.next_live(index, page_size)
+    return [indexed.row(i) for i in positions]
+
+
+def deleted(span: int, ratio: float, clustered: bool,
+            rng: random.Random) -> List[int]:
+    """
+    Positions to delete: a random sample, or runs of 1000 positions.
+    """
+    count = int(span * ratio)
+    if not clustered:
+        return rng.sample(range(span), count)
+    runs = rng.sample(range(span // 1000), count // 1000)
+    return [i for run in runs for i in range(run * 1000, run * 1000 + 1000)]
+
+
+def bench(name: str, make, lookup, dataset: List[List], victims: List[int],
+          starts: List[int], page_size: int) -> None:
+    """
+    Builds an index, deletes victims, then serves a page from each start.
+    """
+    tracemalloc.start()
+    indexed = make(dataset)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for i in victims:
+        del indexed[i]
+    delete = (time.perf_counter() - start) / max(len(victims), 1) * 1e6
+    start = time.perf_counter()
+    for index in starts:
+        lookup(indexed, index, page_size)
+    page = (time.perf_counter() - start) / len(starts)
+    print("  {:>6} {:>10.0f} {:>11} {:>10.1f}".format(
+        name, held / 1024, "{:.2f}".format(delete) if victims else "-",
+        page * 1e6))
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    page_size = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    dataset = load_dataset(Server.DATA_FILE) * copies
+    span = len(dataset)
+    rng = random.Random(0)
+    starts = [rng.randrange(span) for _ in range(requests)]
+    print("{} rows, page_size {}".format(span, page_size))
+    for clustered in (False, True):
+        for ratio in RATIOS:
+            victims = deleted(span, ratio, clustered, rng)
+            print("{} deletions, ratio {}".format(
+                "clustered" if clustered else "random", ratio))
+            print("  {:>6} {:>10} {:>11} {:>10}".format(
+                "index", "held KiB", "delete us", "page us"))
+            bench("dict", lambda rows: dict(enumerate(rows)),
+                  lambda indexed, index, size: dict_hyper_index(
+                      indexed, span, index, size),
+                  dataset, victims, starts, page_size)
+            bench("live", LiveIndex, live_hyper_index,
+                  dataset, victims, starts, page_size)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Exporting the dataset to CSV: repeated get_hyper calls against the
+streaming iter_rows API, time and peak memory of the whole job.
+
+Usage: ./benchmark_export.py [page_size]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from streaming import write_csv
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def get_hyper_rows(server, page_size: int):
+    """
+    The rows of every page, fetched the way export jobs used to.
+    """
+    page = 1
+    while page is not None:
+        hyper = server.get_hyper(page, page_size)
+        yield from hyper["data"]
+        page = hyper["next_page"]
+
+
+def export(rows, path: str):
+    """
+    Writes rows to path as CSV, returning seconds and peak bytes.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, "w", newline="") as f:
+        write_csv(rows(), f)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    path = os.path.join(tempfile.mkdtemp(), "export.csv")
+    jobs = [
+        ("get_hyper", "list",
+         lambda: get_hyper_rows(Server("list"), page_size)),
+        ("iter_rows", "list", lambda: Server("list").iter_rows(page_size)),
+        ("iter_rows", "mmap", lambda: Server("mmap").iter_rows(page_size)),
+        ("cursor", "mmap", lambda: DelServer("mmap").iter_rows(page_size)),
+    ]
+    print("{:>10} {:>8} {:>10} {:>10}".format(
+        "api", "storage", "ms", "peak KiB"))
+    try:
+        for api, storage, rows in jobs:
+            elapsed, peak = export(rows, path)
+            print("{:>10} {:>8} {:>10.1f} {:>10.0f}".format(
+                api, storage, elapsed * 1e3, peak / 1024))
+    finally:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
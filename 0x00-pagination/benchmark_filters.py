@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Filtered pages through the secondary indexes against scanning the
+dataset for each request.
+
+Usage: ./benchmark_filters.py [requests]
+"""
+
+import sys
+import time
+
+from aggregate_views import ETHNICITIES
+from secondary_index import DatasetIndex
+
+Server = __import__('2-hypermedia_pagination').Server
+QUERIES = [
+    {"year": "2016", "gender": "FEMALE", "ethnicity": "HISPANIC"},
+    {"ethnicity": "WHITE NON HISPANIC"},
+    {"name": "Olivia"},
+    {"prefix": "Ma", "gender": "MALE"},
+]
+
+
+def scan_page(dataset, page: int, page_size: int, year=None, gender=None,
+              ethnicity=None, name=None, prefix=None):
+    """
+    The page of matching rows found by scanning every row.
+    """
+    rows = [row for row in dataset
+            if (year is None or row[0] == year) and
+            (gender is None or row[1] == gender) and
+            (ethnicity is None or
+             ETHNICITIES.get(row[2], row[2]) == ethnicity) and
+            (name is None or row[3].casefold() == name.casefold()) and
+            (prefix is None or
+             row[3].casefold().startswith(prefix.casefold()))]
+    return rows[(page - 1) * page_size:page * page_size]
+
+
+def per_call_us(call, requests: int) -> float:
+    """
+    Mean microseconds of call() over requests calls.
+    """
+    start = time.perf_counter()
+    for _ in range(requests):
+        call()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    server = Server()
+    dataset = server.dataset()
+    start = time.perf_counter()
+    server.index()
+    print("index built in {:.1f} ms".format(
+        (time.perf_counter() - start) * 1e3))
+    print("{:>58} {:>8} {:>10} {:>10} {:>10}".format(
+        "filters", "matches", "scan us", "first us", "cached us"))
+    for query in QUERIES:
+        index = DatasetIndex(dataset)
+        start = time.perf_counter()
+        matches = len(index.filter(**query))
+        first = (time.perf_counter() - start) * 1e6
+        cached = per_call_us(
+            lambda: server.get_filtered_page(3, 10, **query), requests)
+        scan = per_call_us(lambda: scan_page(dataset, 3, 10, **query),
+                           max(requests // 20, 1))
+        print("{:>58} {:>8} {:>10.0f} {:>10.0f} {:>10.1f}".format(
+            str(query), matches, scan, first, cached))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+First-page latency of a fresh Server against the size of the CSV file,
+for the list storage and the memory-mapped storage (cold, without an
+index file, and warm, reusing the persisted index).
+
+Usage: ./benchmark_first_page.py [copies ...]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+Server = __import__('2-hypermedia_pagination').Server
+
+
+def grow_csv(path: str, copies: int) -> None:
+    """
+    Writes the dataset repeated copies times, with one header, to path.
+    """
+    with open(Server.DATA_FILE) as source:
+        header = source.readline()
+        body = source.read()
+    with open(path, "w") as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+
+
+def first_page_ms(path: str, storage: str) -> float:
+    """
+    Milliseconds taken by a new Server to return page 1 of path.
+    """
+    start = time.perf_counter()
+    server = Server(storage)
+    server.DATA_FILE = path
+    server.get_page(1, 10)
+    return (time.perf_counter() - start) * 1e3
+
+
+if __name__ == "__main__":
+    copies = [int(c) for c in sys.argv[1:]] or [1, 10, 50]
+    workdir = tempfile.mkdtemp()
+    print("{:>8} {:>8} {:>10} {:>12} {:>12}".format(
+        "rows", "MiB", "list ms", "mmap cold", "mmap warm"))
+    try:
+        for count in copies:
+            path = os.path.join(workdir, "names_x{}.csv".format(count))
+            grow_csv(path, count)
+            listed = first_page_ms(path, "list")
+            cold = first_page_ms(path, "mmap")
+            server = Server("mmap")
+            server.DATA_FILE = path
+            len(server.dataset())  # Index it all once, persisting it
+            warm = first_page_ms(path, "mmap")
+            print("{:>8} {:>8.1f} {:>10.1f} {:>12.2f} {:>12.2f}".format(
+                len(server.dataset()), os.path.getsize(path) / 2 ** 20,
+                listed, cold, warm))
+    finally:
+        shutil.rmtree(workdir)
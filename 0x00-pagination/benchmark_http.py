@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Load test of the pagination HTTP API: requests per second with the page
+body cache off and on, with the standard json module and orjson, and
+for clients revalidating their copy with If-None-Match.
+
+Usage: ./benchmark_http.py [clients] [requests] [page_size]
+"""
+
+import http.client
+import random
+import sys
+import threading
+import time
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import pagination_app
+
+# Pages drawn by the clients, few enough to be cached
+WORKING_SET = 200
+
+
+class QuietHandler(WSGIRequestHandler):
+    """
+    Serves keep-alive connections without logging every request.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_request(self, *args) -> None:
+        pass
+
+
+def client(port: int, paths: list, conditional: bool) -> None:
+    """
+    Requests every path over one keep-alive connection, sending back
+    the ETag of the previous response to the same path if conditional.
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags = {}
+    for path in paths:
+        headers = {}
+        if conditional and path in etags:
+            headers["If-None-Match"] = etags[path]
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        assert response.status in (200, 304), response.status
+        etags[path] = response.getheader("ETag")
+    conn.close()
+
+
+def run(port: int, clients: int, requests: int, page_size: int,
+        conditional: bool = False) -> float:
+    """
+    Returns the requests per second served to clients concurrent
+    clients, each making requests requests to random pages.
+    """
+    rng = random.Random(0)
+    endpoints = ("pages", "hyper")
+    work = [["/api/v1/{}?page={}&page_size={}".format(
+                rng.choice(endpoints), rng.randrange(1, WORKING_SET),
+                page_size)
+             for _ in range(requests)] for _ in range(clients)]
+    if conditional:  # Every client has seen its pages once already
+        work = [paths + paths for paths in work]
+        for paths in work:
+            client(port, paths[:requests], False)
+    threads = [threading.Thread(target=client,
+                                args=(port, paths, conditional))
+               for paths in work]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(map(len, work)) / (time.perf_counter() - start)
+
+
+def body_us(page_size: int, repeat: int = 2000) -> float:
+    """
+    Mean microseconds to get the body of a random get_hyper page from
+    the warm page cache, outside of any HTTP handling.
+    """
+    rng = random.Random(0)
+    server, page_cache = pagination_app.server, pagination_app.page_cache
+    pages = [rng.randrange(1, WORKING_SET) for _ in range(repeat)]
+    for _ in range(2):  # The first pass fills the cache
+        start = time.perf_counter()
+        for page in pages:
+            page_cache.get(("body", page, page_size), "",
+                           lambda: server.get_hyper(page, page_size))
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    page_size = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    httpd = make_server("127.0.0.1", 0, pagination_app.app, threaded=True,
+                        request_handler=QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    port = httpd.server_port
+    pagination_app.server.dataset()
+    pagination_app.del_server.version()
+
+    orjson = pagination_app.orjson
+    encoders = (("json", None),) + ((("orjson", orjson),) if orjson else ())
+    print("{} clients x {} requests, page_size {}".format(
+        clients, requests, page_size))
+    print("{:>8} {:>12} {:>10} {:>9}".format("encoder", "page cache",
+                                             "req/s", "body us"))
+    try:
+        for name, module in encoders:
+            pagination_app.orjson = module
+            for size in (0, 1024):
+                pagination_app.page_cache = pagination_app.PageCache(size)
+                if size:
+                    run(port, 1, WORKING_SET * 4, page_size)  # Warm it
+                print("{:>8} {:>12} {:>10.0f} {:>9.1f}".format(
+                    name, "on" if size else "off",
+                    run(port, clients, requests, page_size),
+                    body_us(page_size)))
+        print("If-None-Match revalidation (304): {:.0f} req/s".format(
+            run(port, clients, requests, page_size, conditional=True)))
+    finally:
+        pagination_app.orjson = orjson
+        httpd.shutdown()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Sorted pages from the cached permutations against sorting the dataset
+on every request.
+
+Usage: ./benchmark_orders.py [requests] [page_size]
+"""
+
+import random
+import sys
+import time
+
+from sort_orders import COLUMNS, parse_order
+
+Server = __import__('2-hypermedia_pagination').Server
+ORDERS = ("-count", "rank", "name")
+
+
+def sorted_page(dataset, page: int, page_size: int, order_by: str):
+    """
+    The page found by sorting every row for this request.
+    """
+    column, descending = parse_order(order_by)
+    field, numeric = COLUMNS[column]
+    rows = sorted(dataset, reverse=descending,
+                  key=(lambda row: int(row[field])) if numeric
+                  else (lambda row: row[field].casefold()))
+    return rows[(page - 1) * page_size:page * page_size]
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("{:>8} {:>10} {:>12} {:>10} {:>12}".format(
+        "storage", "order_by", "sort us", "build ms", "page us"))
+    for storage in ("list", "snapshot"):
+        server = Server(storage)
+        dataset = server.dataset()
+        total_pages = len(dataset) // page_size
+        rng = random.Random(0)
+        pages = [rng.randrange(1, total_pages + 1) for _ in range(requests)]
+        for order_by in ORDERS:
+            start = time.perf_counter()
+            for page in pages[:10]:
+                sorted_page(dataset[:], page, page_size, order_by)
+            sort = (time.perf_counter() - start) / 10
+            start = time.perf_counter()
+            server.orders().permutation(order_by)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            for page in pages:
+                server.get_hyper(page, page_size, order_by)
+            per_page = (time.perf_counter() - start) / requests
+            print("{:>8} {:>10} {:>12.0f} {:>10.1f} {:>12.1f}".format(
+                storage, order_by, sort * 1e6, build * 1e3, per_page * 1e6))
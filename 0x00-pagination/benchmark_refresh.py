@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Following an appended CSV file: refresh parsing only the new rows
+against loading a new Server from the grown file.
+
+Usage: ./benchmark_refresh.py [copies] [appends] [rows]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmark_first_page import grow_csv
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def loaded(server_class, path: str, storage: str):
+    """
+    A Server of server_class over path with its dataset loaded, and
+    indexed if it is deletion-resilient.
+    """
+    server = server_class(storage)
+    server.DATA_FILE = path
+    if server_class is DelServer:
+        server.indexed_dataset()
+    else:
+        server.dataset()
+    return server
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    appends = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "names_x{}.csv".format(copies))
+    with open(Server.DATA_FILE) as f:
+        new_rows = f.readlines()[1:rows + 1]
+    print("{:>10} {:>9} {:>12} {:>12} {:>8}".format(
+        "server", "storage", "reload ms", "refresh ms", "speedup"))
+    try:
+        for server_class in (Server, DelServer):
+            for storage in ("list", "snapshot"):
+                grow_csv(path, copies)
+                server = loaded(server_class, path, storage)
+                server.refresh()  # Finds where the loaded rows end
+                reload = refresh = 0.0
+                for _ in range(appends):
+                    with open(path, "a") as f:
+                        f.writelines(new_rows)
+                    start = time.perf_counter()
+                    assert server.refresh() == rows
+                    refresh += time.perf_counter() - start
+                    start = time.perf_counter()
+                    loaded(server_class, path, storage)
+                    reload += time.perf_counter() - start
+                print("{:>10} {:>9} {:>12.1f} {:>12.2f} {:>7.0f}x".format(
+                    server_class.__module__.split("-")[0] + "-Server",
+                    storage, reload / appends * 1e3,
+                    refresh / appends * 1e3, reload / refresh))
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Scaling of the ShardedServer with its number of workers: startup,
+map-reduce aggregations and page requests.
+
+Usage: ./benchmark_sharded_server.py [copies] [requests]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmark_first_page import grow_csv
+from dataset_storage import load_dataset
+from sharded_server import ShardedServer
+
+WORKERS = (1, 2, 4, 8)
+
+
+def timed_ms(call, repeat: int = 1) -> float:
+    """
+    Mean milliseconds of call() over repeat calls.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "names_x{}.csv".format(copies))
+    grow_csv(path, copies)
+    load_dataset(path, "snapshot")  # Startup then always maps it
+    print("{} CPUs".format(os.cpu_count()))
+    print("{:>8} {:>11} {:>14} {:>14} {:>10}".format(
+        "workers", "startup ms", "by name ms", "by year ms", "page us"))
+    try:
+        for workers in WORKERS:
+            start = time.perf_counter()
+            server = ShardedServer(workers, "snapshot", path)
+            startup = (time.perf_counter() - start) * 1e3
+            by_name = timed_ms(lambda: server.aggregate("name"), 3)
+            by_year = timed_ms(lambda: server.aggregate("year"), 3)
+            rng = random.Random(0)
+            pages = [rng.randrange(1, server.total // 100)
+                     for _ in range(requests)]
+            page = timed_ms(lambda: server.get_page(pages.pop(), 100),
+                            requests)
+            server.close()
+            print("{:>8} {:>11.0f} {:>14.0f} {:>14.0f} {:>10.0f}".format(
+                workers, startup, by_name, by_year, page * 1e3))
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Startup time of the hypermedia Servers, from construction to the first
+page served: CSV parsing against loading the binary snapshot.
+
+Usage: ./benchmark_startup.py [repeat]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from dataset_snapshot import snapshot_dataset, snapshot_path
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def startup_ms(make, path: str, storage: str, first_page) -> float:
+    """
+    Milliseconds from creating a Server on path to its first page.
+    """
+    start = time.perf_counter()
+    server = make(storage)
+    server.DATA_FILE = path
+    first_page(server)
+    return (time.perf_counter() - start) * 1e3
+
+
+def best_ms(repeat: int, prepare, *args) -> float:
+    """
+    Best of repeat runs of startup_ms, calling prepare before each.
+    """
+    times = []
+    for _ in range(repeat):
+        prepare()
+        times.append(startup_ms(*args))
+    return min(times)
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, os.path.basename(Server.DATA_FILE))
+    shutil.copy(Server.DATA_FILE, path)
+    snap = snapshot_path(path)
+
+    def no_snapshot():
+        if os.path.exists(snap):
+            os.remove(snap)
+
+    def keep():
+        pass
+
+    servers = [
+        ("2-hypermedia", Server, lambda s: s.get_hyper(1, 10)),
+        ("3-del", DelServer, lambda s: s.get_hyper_index(0, 10)),
+    ]
+    print("{:>13} {:>10} {:>14} {:>13}".format(
+        "server", "csv ms", "snapshot cold", "snapshot ms"))
+    try:
+        for name, make, first_page in servers:
+            parsed = best_ms(repeat, keep, make, path, "list", first_page)
+            cold = best_ms(repeat, no_snapshot, make, path, "snapshot",
+                           first_page)
+            warm = best_ms(repeat, keep, make, path, "snapshot", first_page)
+            print("{:>13} {:>10.2f} {:>14.2f} {:>13.2f}".format(
+                name, parsed, cold, warm))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            snapshot_dataset(path, verify=False)
+        unverified = (time.perf_counter() - start) / repeat * 1e3
+        print("snapshot load without the crc32 check: {:.2f} ms, {} KiB "
+              "on disk".format(unverified, os.path.getsize(snap) // 1024))
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compares the dataset storages of the hypermedia Server: load time,
+memory held by the dataset and get_page/get_hyper latency.
+
+Usage: ./benchmark_storage.py [requests] [page_size]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from dataset_storage import STORAGES
+
+Server = __import__('2-hypermedia_pagination').Server
+
+
+def bench(storage: str, requests: int, page_size: int) -> dict:
+    """
+    Loads a Server with storage and times random page requests.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    server = Server(storage)
+    total = len(server.dataset())
+    load = time.perf_counter() - start
+
+    # tracemalloc slows loading down, so memory gets its own load
+    del server
+    gc.collect()
+    tracemalloc.start()
+    server = Server(storage)
+    server.dataset()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    rng = random.Random(0)
+    pages = [rng.randrange(1, total // page_size + 1)
+             for _ in range(requests)]
+    start = time.perf_counter()
+    for page in pages:
+        server.get_page(page, page_size)
+    get_page = (time.perf_counter() - start) / requests
+    start = time.perf_counter()
+    for page in pages:
+        server.get_hyper(page, page_size)
+    get_hyper = (time.perf_counter() - start) / requests
+    return {"load_ms": load * 1e3, "held_kib": held / 1024,
+            "get_page_us": get_page * 1e6, "get_hyper_us": get_hyper * 1e6}
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("{:>10} {:>9} {:>10} {:>12} {:>13}".format(
+        "storage", "load ms", "held KiB", "get_page us", "get_hyper us"))
+    for storage in STORAGES:
+        report = bench(storage, requests, page_size)
+        print("{:>10} {:>9.1f} {:>10.0f} {:>12.1f} {:>13.1f}".format(
+            storage, report["load_ms"], report["held_kib"],
+            report["get_page_us"], report["get_hyper_us"]))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Aggregate views: building them, paging them against a full scan per
+request, and keeping them current while rows are deleted.
+
+Usage: ./benchmark_views.py [deletes]
+"""
+
+import random
+import sys
+import time
+from collections import Counter
+
+from aggregate_views import group_keys
+
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def scan_totals(server) -> list:
+    """
+    The first page of the totals per name, by scanning the live rows.
+    """
+    indexed_data = server.indexed_dataset()
+    totals = Counter()
+    for position in indexed_data:
+        row = indexed_data.row(position)
+        totals[group_keys(row)[0]] += int(row[4])
+    return sorted(totals.items(), key=lambda item: (-item[1], item[0]))[:10]
+
+
+def timed_us(call, repeat: int) -> float:
+    """
+    Mean microseconds of call() over repeat calls.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    deletes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for dedupe in (False, True):
+        start = time.perf_counter()
+        server = DelServer(dedupe=dedupe)
+        rows = len(server.dataset())
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        views = server.views()
+        build = time.perf_counter() - start
+        print("dedupe={}: {} rows loaded in {:.1f} ms, views built in "
+              "{:.1f} ms".format(dedupe, rows, load * 1e3, build * 1e3))
+    print("  totals per name, page 1: scan {:.0f} us, view {:.1f} us".format(
+        timed_us(lambda: scan_totals(server), 10),
+        timed_us(lambda: views.get_hyper("name", 1, 10), 1000)))
+
+    rng = random.Random(0)
+    victims = rng.sample(range(rows), deletes)
+    start = time.perf_counter()
+    for index in victims:
+        server.delete(index)
+        views.get_hyper("top_names_by_year", 1, 10)
+    per_delete = (time.perf_counter() - start) / deletes
+    print("  delete then read a top view: {:.1f} us each".format(
+        per_delete * 1e6))
+    start = time.perf_counter()
+    for index in rng.sample(sorted(server.indexed_dataset()), 50):
+        server.delete(index)
+        views.get_hyper("name", 1, 10)
+    print("  delete then read the name totals: {:.0f} us each, against "
+          "{:.0f} us to scan".format(
+              (time.perf_counter() - start) / 50 * 1e6,
+              timed_us(lambda: scan_totals(server), 10)))
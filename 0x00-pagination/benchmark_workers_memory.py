@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Memory held by each worker process serving the dataset: parsing the
+CSV in every worker, mapping its snapshot file, or attaching to the
+dataset published once in shared memory.
+
+Usage: ./benchmark_workers_memory.py [copies] [workers]
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmark_first_page import grow_csv
+from dataset_storage import load_dataset
+from shared_dataset import publish_dataset, unpublish_dataset
+
+Server = __import__('2-hypermedia_pagination').Server
+
+STORAGES = ("list", "snapshot", "shared")
+
+
+def memory_kb() -> tuple:
+    """
+    Returns the resident and proportional set sizes of this process, in
+    kB. Pages shared by n processes count 1/n towards each one's PSS.
+    """
+    sizes = {}
+    for source, field in (("/proc/self/status", "VmRSS:"),
+                          ("/proc/self/smaps_rollup", "Pss:")):
+        with open(source) as f:
+            for line in f:
+                if line.startswith(field):
+                    sizes[field] = int(line.split()[1])
+    return sizes["VmRSS:"], sizes["Pss:"]
+
+
+def serve(path: str, storage: str, ready, done) -> None:
+    """
+    Worker process: loads the dataset, pages through all of it, reports
+    its memory growth, then waits so all workers are measured together.
+    """
+    Server.DATA_FILE = path
+    before = memory_kb()
+    server = Server(storage)
+    page, page_size = 1, 1000
+    while server.get_page(page, page_size):
+        page += 1
+    rss, pss = memory_kb()
+    ready.put((rss - before[0], pss - before[1]))
+    done.wait()
+    ready.put(memory_kb()[1] - before[1])
+
+
+def measure(path: str, storage: str, workers: int) -> tuple:
+    """
+    Returns the mean RSS growth, and the mean PSS growth once every
+    worker has loaded, of workers processes using storage.
+    """
+    context = multiprocessing.get_context("spawn")
+    ready, done = context.Queue(), context.Event()
+    processes = [context.Process(target=serve,
+                                 args=(path, storage, ready, done))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    rss = [ready.get()[0] for _ in processes]
+    done.set()
+    pss = [ready.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return sum(rss) / workers / 1024, sum(pss) / workers / 1024
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "names_x{}.csv".format(copies))
+    grow_csv(path, copies)
+    load_dataset(path, "snapshot")
+    publish_dataset(path)
+    print("{} rows, {} workers".format(len(load_dataset(path, "snapshot")),
+                                       workers))
+    print("{:>10} {:>16} {:>16}".format("storage", "RSS MB/worker",
+                                        "PSS MB/worker"))
+    try:
+        for storage in STORAGES:
+            rss, pss = measure(path, storage, workers)
+            print("{:>10} {:>16.1f} {:>16.1f}".format(storage, rss, pss))
+    finally:
+        unpublish_dataset(path)
+        shutil.rmtree(workdir)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Defines a typed, column-oriented store for the popular baby names rows.
+"""
+
+import csv
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, Sequence, Union
+
+
+class Categorical:
+    """
+    A dictionary-encoded column: each row stores a small integer code
+    into a table holding every distinct value once.
+    """
+
+    def __init__(self, typecode: str, codes: Sequence[int] = None,
+                 values: List[str] = None):
+        """
+        Args:
+            typecode (str): array typecode of the codes.
+            codes (Sequence[int]): existing codes, an empty array if None.
+            values (List[str]): the value of each code.
+        """
+        self.codes = array(typecode) if codes is None else codes
+        self.values = [] if values is None else values
+        self.lookup = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        """
+        Returns the code of value, adding it to the table if new.
+        """
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: str) -> None:
+        """
+        Appends one row holding value.
+        """
+        self.codes.append(self.encode(value))
+
+    def extend(self, values: Iterable[str]) -> None:
+        """
+        Appends one row per value.
+        """
+        self.codes.extend(map(self.encode, values))
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory used by codes and values.
+        """
+        return (len(self.codes) * self.codes.itemsize +
+                sum(len(value) + 49 for value in self.values))
+
+
+class ColumnarDataset:
+    """
+    Stores the dataset as typed columns: Year of Birth, Count and Rank
+    as integer arrays, Gender, Ethnicity and Child's First Name as
+    dictionary-encoded categoricals. Rows are only materialized, as
+    lists of strings like the CSV rows, when they are indexed.
+    """
+
+    def __init__(self, years: Sequence[int] = None,
+                 genders: Categorical = None,
+                 ethnicities: Categorical = None,
+                 names: Categorical = None,
+                 counts: Sequence[int] = None,
+                 ranks: Sequence[int] = None):
+        """
+        Builds an empty dataset unless existing columns are given.
+        """
+        self.years = array("H") if years is None else years
+        self.genders = Categorical("B") if genders is None else genders
+        self.ethnicities = (Categorical("B") if ethnicities is None
+                            else ethnicities)
+        self.names = Categorical("I") if names is None else names
+        self.counts = array("I") if counts is None else counts
+        self.ranks = array("I") if ranks is None else ranks
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]]) -> "ColumnarDataset":
+        """
+        Builds a dataset from CSV rows, header excluded.
+        """
+        dataset = cls()
+        dataset.extend(rows)
+        return dataset
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ColumnarDataset":
+        """
+        Builds a dataset from a CSV file with a header row.
+        """
+        with open(path) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Exclude header row
+            return cls.from_rows(reader)
+
+    def append(self, row: List[str]) -> None:
+        """
+        Appends one CSV row.
+        """
+        year, gender, ethnicity, name, count, rank = row
+        self.years.append(int(year))
+        self.genders.append(gender)
+        self.ethnicities.append(ethnicity)
+        self.names.append(name)
+        self.counts.append(int(count))
+        self.ranks.append(int(rank))
+
+    def extend(self, rows: Iterable[List[str]], chunk: int = 4096) -> None:
+        """
+        Appends every CSV row of rows, converting chunk rows at a time
+        column by column.
+        """
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, chunk))
+            if not batch:
+                return
+            years, genders, ethnicities, names, counts, ranks = zip(*batch)
+            self.years.extend(map(int, years))
+            self.genders.extend(genders)
+            self.ethnicities.extend(ethnicities)
+            self.names.extend(names)
+            self.counts.extend(map(int, counts))
+            self.ranks.extend(map(int, ranks))
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def row(self, index: int) -> List[str]:
+        """
+        Returns the row at index as a list of strings.
+        """
+        return [str(self.years[index]), self.genders[index],
+                self.ethnicities[index], self.names[index],
+                str(self.counts[index]), str(self.ranks[index])]
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """
+        Returns the rows from start to end (excluded) as lists of strings.
+        """
+        genders = self.genders.values
+        ethnicities = self.ethnicities.values
+        names = self.names.values
+        return [[str(year), genders[gender], ethnicities[ethnicity],
+                 names[name], str(count), str(rank)]
+                for year, gender, ethnicity, name, count, rank in zip(
+                    self.years[start:end], self.genders.codes[start:end],
+                    self.ethnicities.codes[start:end],
+                    self.names.codes[start:end], self.counts[start:end],
+                    self.ranks[start:end])]
+
+    def __getitem__(self, index: Union[int, slice]):
+        """
+        Materializes a row, or a list of rows for a slice.
+        """
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if step == 1:
+                return self.rows(start, end)
+            return [self.row(i) for i in range(start, end, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.row(index)
+
+    def nbytes(self) -> Dict[str, int]:
+        """
+        Returns the approximate memory used by each column.
+        """
+        return {
+            "year": len(self.years) * self.years.itemsize,
+            "gender": self.genders.nbytes(),
+            "ethnicity": self.ethnicities.nbytes(),
+            "name": self.names.nbytes(),
+            "count": len(self.counts) * self.counts.itemsize,
+            "rank": len(self.ranks) * self.ranks.itemsize,
+        }
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Defines a memory-mapped CSV reader that locates rows through a lazily
+built, persisted line-offset index.
+"""
+
+import csv
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Optional, Sequence, Union
+
+
+class IndexedCSV:
+    """
+    Serves rows of a CSV file (header excluded) straight from a memory
+    map. The byte offset of each row is indexed the first time a row at
+    or past it is requested, so the first pages are found without
+    reading the rest of the file. Once the whole file has been indexed
+    the offsets are saved next to it (PATH.idx) and reused by later
+    instances while the file keeps the same size and mtime.
+
+    Rows are assumed not to contain quoted newlines.
+    """
+    INDEX_SUFFIX = ".idx"
+    MAGIC = b"BNIDX"
+    VERSION = 1
+    HEADER = struct.Struct("<5sBxxQQQ")  # magic, version, size, mtime, rows
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        """
+        Args:
+            path (str): The CSV file, with a header row.
+            index_path (str): Where the offsets are persisted,
+                path + ".idx" by default.
+        """
+        self.path = path
+        self.index_path = index_path or path + self.INDEX_SUFFIX
+        stat = os.stat(path)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.file = open(path, "rb")
+        self.index_map = None
+        self.map = (mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                    if self.size else b"")
+        # offsets[i] is where row i starts; the last one is where the
+        # next, not yet indexed, row starts
+        self.offsets = self._load_index()
+        self.complete = self.offsets is not None
+        if self.offsets is None:
+            header_end = self.map.find(b"\n")
+            start = self.size if header_end < 0 else header_end + 1
+            self.offsets = array("Q", [start])
+
+    def _load_index(self) -> Optional[Sequence[int]]:
+        """
+        Returns the persisted offsets if they match the file, else None.
+        They are mapped rather than read, so reopening a large file
+        costs no more than reopening a small one.
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, version, size, mtime_ns, rows = self.HEADER.unpack_from(
+                index_map)
+        except struct.error:
+            return None
+        end = self.HEADER.size + (rows + 1) * 8
+        if ((magic, version, size, mtime_ns) != (
+                self.MAGIC, self.VERSION, self.size, self.mtime_ns) or
+                len(index_map) != end):
+            return None
+        self.index_map = index_map
+        return memoryview(index_map)[self.HEADER.size:end].cast("Q")
+
+    def _save_index(self) -> None:
+        """
+        Persists the complete offsets, if the directory is writable.
+        """
+        tmp_path = "{}.{}.tmp".format(self.index_path, os.getpid())
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.size,
+                                         self.mtime_ns,
+                                         len(self.offsets) - 1))
+                self.offsets.tofile(f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+
+    def _index_until(self, row: Optional[int]) -> None:
+        """
+        Indexes offsets up to the end of row, or of the file if None.
+        """
+        offsets = self.offsets
+        find = self.map.find
+        size = self.size
+        while not self.complete and (row is None or len(offsets) <= row + 1):
+            start = offsets[-1]
+            if start >= size:
+                self.complete = True
+                self._save_index()
+                break
+            end = find(b"\n", start)
+            offsets.append(size if end < 0 else end + 1)
+
+    def __len__(self) -> int:
+        self._index_until(None)
+        return len(self.offsets) - 1
+
+    def rows(self, start: int, end: int) -> List[List[str]]:
+        """
+        Parses the rows from start to end (excluded).
+        """
+        self._index_until(end - 1)
+        end = min(end, len(self.offsets) - 1)
+        if start >= end:
+            return []
+        chunk = self.map[self.offsets[start]:self.offsets[end]]
+        return list(csv.reader(chunk.decode().splitlines()))
+
+    def __getitem__(self, index: Union[int, slice]):
+        """
+        Parses a row, or a list of rows for a slice.
+        """
+        if isinstance(index, slice):
+            if (index.step in (None, 1) and (index.start or 0) >= 0 and
+                    index.stop is not None and index.stop >= 0):
+                # Forward slices never need the rest of the file indexed
+                return self.rows(index.start or 0, index.stop)
+            start, end, step = index.indices(len(self))
+            if step == 1:
+                return self.rows(start, end)
+            return [self.rows(i, i + 1)[0] for i in range(start, end, step)]
+        if index < 0:
+            index += len(self)
+        rows = self.rows(index, index + 1) if index >= 0 else []
+        if not rows:
+            raise IndexError("dataset index out of range")
+        return rows[0]
+
+    def close(self) -> None:
+        """
+        Releases the memory map and the file.
+        """
+        if self.index_map is not None:
+            self.offsets.release()
+            self.index_map.close()
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
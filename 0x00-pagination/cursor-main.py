@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Main file: cursor tokens, and Server.get_cursor resuming them
+"""
+
+from cursor import Cursor, decode_cursor, encode_cursor
+
+Server = __import__('3-hypermedia_del_pagination').Server
+
+for cursor in (Cursor("1b2c-0badf00d", "position", 41, 41),
+               Cursor("v", "-count", "Olivia", 0),
+               Cursor("v:dedupe", "name", "Émile", 19417)):
+    token = encode_cursor(cursor)
+    assert "=" not in token and decode_cursor(token) == cursor
+    print(token)
+
+token = encode_cursor(Cursor("v", "position", 3, 3))
+for bad in (token[:-2] + ("AA" if token[-2:] != "AA" else "BB"),
+            token[:10], "", "!!!!", "bm9wZQ",
+            encode_cursor(Cursor("v", "position", 3, -1)),
+            encode_cursor(Cursor("v", "position", 3, "3"))):
+    try:
+        decode_cursor(bad)
+        print("accepted: {}".format(bad))
+    except ValueError as e:
+        print("ValueError {}".format(e))
+
+server = Server()
+page = server.get_cursor(None, 10)
+assert page["data"] == server.get_hyper_index(0, 10)["data"]
+# Deleting rows already served or yet to be served never skips a row
+server.delete(5)
+server.delete(10)
+nxt = server.get_cursor(page["next_cursor"], 10)
+assert nxt["data"] == server.get_hyper_index(11, 10)["data"]
+# Any Server of the same data file resumes it
+assert Server("mmap").get_cursor(page["next_cursor"], 3)["data"] == \
+    Server().get_cursor(page["next_cursor"], 3)["data"]
+print(nxt["data"][0], nxt["page_size"])
+
+rows = sum(len(p["data"]) for p in Server().iter_pages(5000))
+assert rows == len(Server().dataset())
+print(rows)
+
+for bad in (encode_cursor(Cursor("10-deadbeef", "position", 0, 0)),
+            encode_cursor(Cursor(server.version(), "-count", 0, 0)),
+            Server(dedupe=True).get_cursor(None, 2)["next_cursor"]):
+    try:
+        server.get_cursor(bad)
+        print("accepted: {}".format(bad))
+    except ValueError as e:
+        print("ValueError {}".format(e))
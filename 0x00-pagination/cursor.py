@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Encodes and decodes the opaque continuation tokens of cursor pagination.
+"""
+
+import base64
+import binascii
+import json
+import struct
+import zlib
+from typing import NamedTuple, Union
+
+FORMAT = 1
+CRC = struct.Struct("<I")
+
+
+class Cursor(NamedTuple):
+    """
+    Where a client stopped: the sort order it pages through, the sort
+    key and position of the last row it received, and the version of
+    the dataset those positions refer to.
+    """
+    version: str
+    order: str
+    key: Union[int, str]
+    position: int
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """
+    Returns cursor as a URL-safe token.
+    """
+    payload = json.dumps([FORMAT] + list(cursor),
+                         separators=(",", ":")).encode()
+    token = base64.urlsafe_b64encode(payload + CRC.pack(zlib.crc32(payload)))
+    return token.rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Returns the cursor of a token made by encode_cursor.
+
+    Raises:
+        ValueError: If token is malformed, corrupted or of another format.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload, (crc,) = raw[:-CRC.size], CRC.unpack(raw[-CRC.size:])
+        if zlib.crc32(payload) != crc:
+            raise ValueError("corrupted cursor")
+        fields = json.loads(payload)
+        if fields[0] != FORMAT:
+            raise ValueError("unknown cursor format")
+        cursor = Cursor(*fields[1:])
+    except (binascii.Error, struct.error, TypeError, IndexError,
+            UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(cursor.position, int) or cursor.position < 0:
+        raise ValueError("invalid cursor")
+    return cursor
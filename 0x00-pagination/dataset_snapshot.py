@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Persists a parsed ColumnarDataset as a binary snapshot and maps it back
+without copying the columns.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import List, Optional, Tuple
+
+from columnar_dataset import Categorical, ColumnarDataset
+
+SNAPSHOT_SUFFIX = ".snap"
+MAGIC = b"BNSNAP"
+VERSION = 1
+# magic, version, byte order, CSV size, CSV mtime, rows, crc32 of the rest
+HEADER = struct.Struct("<6sBBQQQI4x")
+# typecode ("s" for a newline-joined table of values), offset, length
+SECTION = struct.Struct("<c7xQQ")
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+ALIGN = 8
+
+
+def _columns(dataset: ColumnarDataset) -> List[Tuple[str, object]]:
+    """
+    Returns the sections of a dataset in snapshot order.
+    """
+    return [
+        ("H", dataset.years),
+        ("B", dataset.genders.codes),
+        ("B", dataset.ethnicities.codes),
+        ("I", dataset.names.codes),
+        ("I", dataset.counts),
+        ("I", dataset.ranks),
+        ("s", "\n".join(dataset.genders.values).encode()),
+        ("s", "\n".join(dataset.ethnicities.values).encode()),
+        ("s", "\n".join(dataset.names.values).encode()),
+    ]
+
+
+def snapshot_path(path: str) -> str:
+    """
+    Returns where the snapshot of the CSV file path is kept.
+    """
+    return path + SNAPSHOT_SUFFIX
+
+
+def pack_snapshot(dataset: ColumnarDataset, size: int = 0,
+                  mtime_ns: int = 0) -> List[bytes]:
+    """
+    Lays dataset out in the snapshot format.
+
+    Args:
+        dataset (ColumnarDataset): The parsed rows.
+        size (int): The size of the CSV file dataset was parsed from.
+        mtime_ns (int): Its modification time.
+
+    Returns:
+        List[bytes]: The chunks to write, in order.
+    """
+    sections = _columns(dataset)
+    offset = HEADER.size + SECTION.size * len(sections)
+    table, payload = [], []
+    for typecode, data in sections:
+        data = memoryview(data).cast("B")
+        padding = -offset % ALIGN
+        payload.append(b"\0" * padding)
+        offset += padding
+        table.append(SECTION.pack(typecode.encode(), offset, len(data)))
+        payload.append(data)
+        offset += len(data)
+    crc = 0
+    for chunk in table + payload:
+        crc = zlib.crc32(chunk, crc)
+    header = HEADER.pack(MAGIC, VERSION, BYTE_ORDER, size, mtime_ns,
+                         len(dataset), crc)
+    return [header] + table + payload
+
+
+def unpack_snapshot(buffer, stamp: Optional[Tuple[int, int]] = None,
+                    verify: bool = True) -> Optional[ColumnarDataset]:
+    """
+    Serves a dataset laid out by pack_snapshot, its integer columns cast
+    straight over buffer without copying.
+
+    Args:
+        buffer: The snapshot bytes, e.g. a memory map.
+        stamp (Tuple[int, int]): The size and mtime the snapshot must
+            have been packed with, or None to accept any.
+        verify (bool): Whether to check the crc32 of the contents.
+
+    Returns:
+        ColumnarDataset: The dataset, or None if buffer is corrupt, from
+        another version or byte order, or does not match stamp.
+    """
+    try:
+        magic, version, order, size, mtime_ns, rows, crc = \
+            HEADER.unpack_from(buffer)
+        if (magic, version, order) != (MAGIC, VERSION, BYTE_ORDER):
+            return None
+        if stamp is not None and (size, mtime_ns) != tuple(stamp):
+            return None
+        view = memoryview(buffer)
+        table = []
+        end = HEADER.size + 9 * SECTION.size
+        for i in range(9):
+            typecode, offset, length = SECTION.unpack_from(
+                buffer, HEADER.size + i * SECTION.size)
+            table.append((typecode, offset, length))
+            end = max(end, offset + length)
+        # buffer may be longer, e.g. shared memory rounded to pages
+        if end > len(view):
+            return None
+        if verify and zlib.crc32(view[HEADER.size:end]) != crc:
+            return None
+        sections = []
+        for typecode, offset, length in table:
+            data = view[offset:offset + length]
+            if typecode == b"s":
+                data = str(data, "utf-8").split("\n") if length else []
+            else:
+                data = data.cast(typecode.decode())
+                if len(data) != rows:
+                    return None
+            sections.append(data)
+    except (struct.error, TypeError, ValueError):
+        return None
+    years, genders, ethnicities, names, counts, ranks = sections[:6]
+    gender_values, ethnicity_values, name_values = sections[6:]
+    return ColumnarDataset(years, Categorical("B", genders, gender_values),
+                           Categorical("B", ethnicities, ethnicity_values),
+                           Categorical("I", names, name_values),
+                           counts, ranks)
+
+
+def write_snapshot(dataset: ColumnarDataset, path: str,
+                   source: str) -> None:
+    """
+    Writes dataset to path atomically, stamped with the size and mtime
+    of the CSV file source it was parsed from.
+
+    Args:
+        dataset (ColumnarDataset): The parsed rows.
+        path (str): The snapshot file.
+        source (str): The CSV file dataset was parsed from.
+    """
+    stat = os.stat(source)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        for chunk in pack_snapshot(dataset, stat.st_size, stat.st_mtime_ns):
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, source: str,
+                  verify: bool = True) -> Optional[ColumnarDataset]:
+    """
+    Maps the snapshot at path, its integer columns served straight from
+    the mapping.
+
+    Args:
+        path (str): The snapshot file.
+        source (str): The CSV file the snapshot must match.
+        verify (bool): Whether to check the crc32 of the contents.
+
+    Returns:
+        ColumnarDataset: The dataset, or None if the snapshot is missing,
+        corrupt, from another version or byte order, or older than the
+        current source.
+    """
+    try:
+        stat = os.stat(source)
+        with open(path, "rb") as f:
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    return unpack_snapshot(snapshot, (stat.st_size, stat.st_mtime_ns),
+                           verify)
+
+
+def snapshot_dataset(source: str, path: Optional[str] = None,
+                     verify: bool = True) -> ColumnarDataset:
+    """
+    Loads the snapshot of the CSV file source, parsing the CSV and
+    writing a fresh snapshot if there is no valid one.
+
+    Args:
+        source (str): The CSV file, with a header row.
+        path (str): The snapshot file, source + ".snap" by default.
+        verify (bool): Whether to check the crc32 of the snapshot.
+
+    Returns:
+        ColumnarDataset: The dataset, read-only when mapped.
+    """
+    path = path or snapshot_path(source)
+    dataset = load_snapshot(path, source, verify)
+    if dataset is None:
+        dataset = ColumnarDataset.from_csv(source)
+        try:
+            write_snapshot(dataset, path, source)
+        except OSError:
+            pass  # Read-only directory: parse again next time
+    return dataset
+
+
+def dataset_version(path: str, chunk: int = 1 << 20,
+                    size: Optional[int] = None) -> str:
+    """
+    Returns a version of the file at path that depends only on its
+    contents, so processes holding the same data agree on it: its size
+    and crc32, or those of its first size bytes if size is given.
+    """
+    crc = read = 0
+    with open(path, "rb") as f:
+        while size is None or read < size:
+            block = f.read(chunk if size is None
+                           else min(chunk, size - read))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            read += len(block)
+    return format_version(read, crc)
+
+
+def format_version(size: int, crc: int) -> str:
+    """
+    Returns the version of contents of size bytes and crc32 crc.
+    """
+    return "{:x}-{:08x}".format(size, crc)
+
+
+def version_size(version: str) -> Optional[int]:
+    """
+    Returns the size of the contents of a version, None if malformed.
+    """
+    try:
+        return int(version.split("-", 1)[0], 16)
+    except ValueError:
+        return None
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Loads the popular baby names dataset in one of several storages.
+"""
+
+import csv
+from typing import Iterable, List, Sequence
+
+from columnar_dataset import ColumnarDataset
+from csv_index import IndexedCSV
+from dataset_snapshot import snapshot_dataset
+from shared_dataset import shared_dataset
+
+STORAGES = ("list", "columnar", "mmap", "snapshot", "shared")
+
+
+def load_dataset(path: str, storage: str = "list",
+                 dedupe: bool = False) -> Sequence[List]:
+    """
+    Loads the rows of a CSV file, header excluded.
+
+    Args:
+        path (str): The CSV file to load.
+        storage (str): "list" for a list of rows of strings,
+            "columnar" for a ColumnarDataset of typed columns, or
+            "mmap" for an IndexedCSV parsing rows from the mapped file
+            on demand, "snapshot" for a ColumnarDataset mapped from
+            the binary snapshot next to the file, written on first use,
+            or "shared" for a ColumnarDataset attached to the copy
+            published in shared memory (see shared_dataset).
+        dedupe (bool): Whether to drop rows repeating an earlier row.
+            The typed storages are rebuilt from the remaining rows, and
+            "mmap" becomes a list, since the file itself is unchanged.
+
+    Returns:
+        Sequence[List]: The rows, supporting len() and slicing.
+
+    Raises:
+        ValueError: If storage is unknown.
+    """
+    if storage == "list":
+        with open(path) as f:
+            reader = csv.reader(f)
+            dataset = [row for row in reader]
+        dataset = dataset[1:]  # Exclude header row
+    elif storage == "columnar":
+        dataset = ColumnarDataset.from_csv(path)
+    elif storage == "mmap":
+        dataset = IndexedCSV(path)
+    elif storage == "snapshot":
+        dataset = snapshot_dataset(path)
+    elif storage == "shared":
+        dataset = shared_dataset(path)
+    else:
+        raise ValueError("unknown storage: {}".format(storage))
+    if not dedupe:
+        return dataset
+    unique = dedupe_rows(dataset[:])
+    if isinstance(dataset, ColumnarDataset):
+        return ColumnarDataset.from_rows(unique)
+    return unique
+
+
+def dedupe_rows(rows: Iterable[List]) -> List[List]:
+    """
+    Returns the rows not repeating an earlier row, in order.
+    """
+    seen = set()
+    unique = []
+    for row in rows:
+        key = tuple(row)
+        if key not in seen:
+            seen.add(key)
+            unique.append(row)
+    return unique
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Main file: CSVTail and Server.refresh following a copy of the data file
+as rows are appended to it
+"""
+
+import os
+import shutil
+import tempfile
+
+from dataset_snapshot import dataset_version
+from dataset_tail import CSVTail
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+with open(Server.DATA_FILE) as f:
+    lines = f.readlines()
+folder = tempfile.mkdtemp()
+path = os.path.join(folder, "names.csv")
+
+
+class Copy(Server):
+    DATA_FILE = path
+
+
+class DelCopy(DelServer):
+    DATA_FILE = path
+
+
+try:
+    # CSVTail alone: whole rows only, and the version of what was read
+    with open(path, "w") as f:
+        f.writelines(lines[:11])
+    tail = CSVTail(path, 10)
+    assert tail.read() == [] and tail.version == dataset_version(path)
+    with open(path, "a") as f:
+        f.writelines(lines[11:14])
+        f.write(lines[14][:5])
+    assert len(tail.read()) == 3 and tail.rows == 13
+    assert tail.version != dataset_version(path)
+    with open(path, "a") as f:
+        f.write(lines[14][5:])
+    assert tail.read() == [lines[14].rstrip("\n").split(",")]
+    assert tail.version == dataset_version(path)
+    print("CSVTail: {} rows, version {}".format(tail.rows, tail.version))
+
+    for storage in ("list", "columnar", "snapshot", "mmap", "shared"):
+        with open(path, "w") as f:
+            f.writelines(lines[:5001])
+        server, del_server = Copy(storage), DelCopy(storage)
+        server.views()
+        del_server.views()
+        first = del_server.get_cursor(None, 4999)
+        last = del_server.get_hyper_index(4995, 10)
+        assert last["next_index"] == 5000
+        del_server.delete(10)
+
+        end = 5001
+        for count in (1, 250, 0, 1000):
+            with open(path, "a") as f:
+                f.writelines(lines[end:end + count])
+                # A row still being written is left for the next refresh
+                f.write(lines[end + count][:7])
+            assert server.refresh() == del_server.refresh() == count
+            end += count
+            with open(path, "r+") as f:
+                f.truncate(os.path.getsize(path) - 7)
+
+        fresh, del_fresh = Copy(), DelCopy()
+        del_fresh.delete(10)
+        rows = end - 1
+        assert server.get_page(1, rows) == fresh.get_page(1, rows)
+        assert server.get_hyper(7, 300) == fresh.get_hyper(7, 300)
+        assert server.get_pages([(1, 10), (40, 100)], "-count") == \
+            fresh.get_pages([(1, 10), (40, 100)], "-count")
+        assert server.views().get_hyper("name", 1, 20) == \
+            fresh.views().get_hyper("name", 1, 20)
+        assert del_server.views().get_hyper("year", 1, 20) == \
+            del_fresh.views().get_hyper("year", 1, 20)
+        # The index and cursor handed out at the end lead to the new rows
+        assert del_server.get_hyper_index(last["next_index"], 5)["data"] == \
+            fresh.get_page(1, 5005)[5000:]
+        resumed = del_server.get_cursor(first["next_cursor"], 3)["data"]
+        assert resumed == fresh.get_page(1, 5002)[4999:]
+        # The version is that of the grown file, and older tokens pass
+        assert del_server.version() == del_fresh.version()
+        assert del_fresh.get_cursor(first["next_cursor"], 3)["data"] == \
+            resumed
+        print("{}: {} rows, {} live".format(
+            storage, len(server.dataset()),
+            len(del_server.indexed_dataset())))
+
+    # Tokens of a longer file are not valid in a shorter one
+    token = del_server.get_cursor(None, 5)["next_cursor"]
+    with open(path, "w") as f:
+        f.writelines(lines[:5001])
+    try:
+        DelCopy().get_cursor(token)
+    except ValueError as e:
+        print("ValueError {}".format(e))
+
+    # Rewriting the file is refused rather than misread
+    with open(path + ".new", "w") as f:
+        f.writelines(lines[:10])
+    os.replace(path + ".new", path)
+    try:
+        server.refresh()
+    except ValueError as e:
+        print("ValueError {}".format(e.args[0].replace(folder, "...")))
+    try:
+        Copy(dedupe=True).refresh()
+    except ValueError as e:
+        print("ValueError {}".format(e))
+finally:
+    shutil.rmtree(folder)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Follows a CSV file that is appended to, parsing only the new rows.
+"""
+
+import csv
+import io
+import os
+import threading
+import zlib
+from typing import Callable, List, Optional, Sequence, Union
+
+from dataset_snapshot import format_version
+
+
+class CSVTail:
+    """
+    Reads the rows appended to a CSV file since the last read. The byte
+    offset after the last complete line read is kept, so each read
+    parses only the bytes appended since; a last line without its
+    newline yet is left for the next read.
+
+    The crc32 of the bytes read so far is carried forward too, so the
+    version of the data read is known without hashing it again.
+
+    Rows are assumed not to contain quoted newlines, and the file to
+    only ever grow by whole rows.
+    """
+
+    def __init__(self, path: str, rows: int, chunk: int = 1 << 20):
+        """
+        Args:
+            path (str): The CSV file, with a header row.
+            rows (int): The number of rows already read, header
+                excluded: reading starts after them.
+            chunk (int): The bytes scanned at a time to skip them.
+        """
+        self.path = path
+        self.rows = rows
+        self.offset = 0
+        self.crc = 0
+        self.inode = os.stat(path).st_ino
+        # Finds the end of the header and the rows already read by
+        # counting newlines, without parsing anything
+        lines = rows + 1
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(chunk), b""):
+                count = block.count(b"\n")
+                if count < lines:
+                    lines -= count
+                    self.offset += len(block)
+                    self.crc = zlib.crc32(block, self.crc)
+                    continue
+                end = -1
+                for _ in range(lines):
+                    end = block.index(b"\n", end + 1)
+                self.offset += end + 1
+                self.crc = zlib.crc32(block[:end + 1], self.crc)
+                return
+
+    @property
+    def version(self) -> str:
+        """
+        The version of the bytes read so far (see
+        dataset_snapshot.dataset_version): that of the whole file once
+        every complete row of it was read.
+        """
+        return format_version(self.offset, self.crc)
+
+    def read(self) -> List[List[str]]:
+        """
+        Returns the rows appended since the last read, if any.
+
+        Raises:
+            ValueError: If the file was truncated or replaced.
+        """
+        stat = os.stat(self.path)
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            raise ValueError("{} was rewritten, reload it".format(self.path))
+        if stat.st_size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return []
+        self.offset += end
+        self.crc = zlib.crc32(data[:end], self.crc)
+        rows = list(csv.reader(io.StringIO(data[:end].decode(),
+                                           newline="")))
+        self.rows += len(rows)
+        return rows
+
+
+class GrowingDataset:
+    """
+    The rows of a storage that cannot be appended to, such as a mapped
+    snapshot or file, followed by the rows appended since it was
+    loaded. The storage is never copied.
+    """
+
+    def __init__(self, base: Sequence[List], rows: Sequence[List] = ()):
+        self.base = base
+        self.base_size = len(base)
+        self.tail: List[List] = list(rows)
+
+    def extend(self, rows: Sequence[List]) -> None:
+        """
+        Appends rows.
+        """
+        self.tail.extend(rows)
+
+    def __len__(self) -> int:
+        return self.base_size + len(self.tail)
+
+    def __getitem__(self, index: Union[int, slice]):
+        """
+        Returns a row, or a list of rows for a slice.
+        """
+        size = self.base_size
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, end, step)]
+            rows = self.base[start:min(end, size)] if start < size else []
+            if end > size:
+                rows.extend(self.tail[max(start, size) - size:end - size])
+            return rows
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+        return self.base[index] if index < size else self.tail[index - size]
+
+
+def extend_dataset(dataset: Sequence[List],
+                   rows: Sequence[List]) -> Sequence[List]:
+    """
+    Appends rows to dataset, in place if it is a list or a
+    GrowingDataset, and returns it; any other storage is wrapped in a
+    GrowingDataset, which is returned instead.
+    """
+    if isinstance(dataset, (list, GrowingDataset)):
+        dataset.extend(rows)
+        return dataset
+    return GrowingDataset(dataset, rows)
+
+
+def start_watch(refresh: Callable[[], int], interval: float = 1.0,
+                lock: Optional[threading.Lock] = None) -> threading.Event:
+    """
+    Calls refresh every interval seconds in a daemon thread, holding
+    lock if given, until the returned event is set. Errors stop the
+    thread and are left to threading.excepthook.
+
+    Args:
+        refresh (Callable): A Server's refresh method.
+        interval (float): The seconds between two calls.
+        lock (threading.Lock): Held by the readers of the Server too,
+            since Servers are not thread-safe.
+    """
+    stop = threading.Event()
+
+    def follow() -> None:
+        while not stop.wait(interval):
+            if lock is None:
+                refresh()
+            else:
+                with lock:
+                    refresh()
+
+    threading.Thread(target=follow, name="dataset-watch",
+                     daemon=True).start()
+    return stop
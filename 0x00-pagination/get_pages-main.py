@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Main file: Server.get_pages against a get_page loop, and index_ranges
+against index_range
+"""
+
+import random
+
+index_range = __import__('0-simple_helper_function').index_range
+index_ranges = __import__('0-simple_helper_function').index_ranges
+Server = __import__('2-hypermedia_pagination').Server
+
+rng = random.Random(0)
+pairs = [(rng.randint(1, 3000), rng.randint(1, 100)) for _ in range(1000)]
+assert index_ranges(pairs) == [index_range(*pair) for pair in pairs]
+print("index_ranges: {} pairs match index_range".format(len(pairs)))
+
+for storage in ("list", "columnar", "snapshot", "mmap"):
+    server = Server(storage)
+    for batch in range(200):
+        # Pages overlapping, touching, repeated, scattered and past the end
+        last = 40 if batch % 2 else 3000
+        pages = [(rng.randint(1, last), rng.choice((1, 2, 7, 10, 100)))
+                 for _ in range(rng.randint(0, 30))]
+        order_by = rng.choice((None, "-count", "name"))
+        assert server.get_pages(pages, order_by) == [
+            server.get_page(page, page_size, order_by)
+            for page, page_size in pages], (storage, pages, order_by)
+    print("{}: 200 batches match get_page".format(storage))
+
+server = Server()
+for pages in ([(1, 2), (0, 3)], [(1.0, 2)], [(1, -1)], [(1, "2")]):
+    try:
+        server.get_pages(pages)
+    except AssertionError as e:
+        print("{}: AssertionError {}".format(pages, e))
+print(server.get_pages([]))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Main file: LiveIndex against a plain dict of the live rows, through
+random deletes, revivals and appends
+"""
+
+import random
+
+from live_index import LiveIndex
+
+rng = random.Random(0)
+for size in (0, 1, 7, 64, 65, 1000):
+    dataset = [[i] for i in range(size)]
+    index = LiveIndex(dataset)
+    reference = {i: row for i, row in enumerate(dataset)}
+    revision = index.revision
+    for step in range(2000):
+        span = index.span
+        action = rng.random()
+        if action < 0.4 and reference:
+            position = rng.choice(list(reference))
+            del index[position]
+            del reference[position]
+        elif action < 0.9 and span:
+            position = rng.randrange(span)
+            index[position] = ["set", step]
+            reference[position] = ["set", step]
+        else:
+            # Appends, sometimes past a gap of deleted positions
+            position = span + rng.choice((0, 0, 1, 70))
+            index.insert(position, ["new", step])
+            reference[position] = ["new", step]
+        assert index.revision == revision + 1
+        revision = index.revision
+
+        live = sorted(reference)
+        assert len(index) == len(live) and list(index) == live
+        start = rng.randrange(index.span + 1)
+        count = rng.randint(1, 100)
+        positions, next_index = index.next_live(start, count)
+        expected = [p for p in live if p >= start][:count]
+        assert positions == expected, (size, step, start, count)
+        if len(expected) < count:
+            assert next_index == index.span
+        else:
+            assert next_index == expected[-1] + 1
+        assert index.rows(positions) == [reference[p] for p in positions]
+        assert index.rank(start) == sum(p < start for p in live)
+        rank = rng.randrange(len(live) + 1)
+        assert index.select(rank) == (
+            live[rank] if rank < len(live) else index.span)
+    print("size {}: {} live of {} positions".format(
+        size, len(index), index.span))
+
+index = LiveIndex([[0], [1], [2]])
+del index[1]
+print(1 in index, index.get(1), index.get(2), index[2])
+for bad in (lambda: index.delete(1), lambda: index.delete(3),
+            lambda: index.insert(-1, []), lambda: index[1]):
+    try:
+        bad()
+    except KeyError as e:
+        print("KeyError", e)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Defines a deletion-aware index over the positions of a dataset.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class LiveIndex(MutableMapping):
+    """
+    Maps dataset positions to rows, like {i: dataset[i]}, without
+    copying the dataset. Deleted positions are cleared in a bitmap and a
+    Fenwick tree counts live positions, so the live rows following any
+    position are found in O(log n + page_size) however many rows were
+    deleted in between.
+
+    Rows set with index[i] = row revive a deleted position, replace a
+    live one or, past the end, append new positions.
+    """
+    # Live rows this close are reached by scanning the bitmap
+    SCAN = 64
+
+    def __init__(self, dataset: Sequence[List]):
+        """
+        Args:
+            dataset (Sequence[List]): The rows, all of them live at first.
+        """
+        self.dataset = dataset
+        self.overrides: Dict[int, List] = {}
+        self.size = len(dataset)
+        self.live = bytearray(b"\x01") * self.size
+        self.count = self.size
+        # Bumped by every change, so views of the rows can tell theirs
+        # are stale
+        self.revision = 0
+        # tree[i] counts the live positions in (i - lowbit(i), i], 1-based
+        self.tree = array("I", (i & -i for i in range(self.size + 1)))
+
+    @property
+    def span(self) -> int:
+        """
+        The number of positions, live or deleted.
+        """
+        return self.size
+
+    def _add(self, position: int, delta: int) -> None:
+        """
+        Adds delta to the live count of position.
+        """
+        tree = self.tree
+        i = position + 1
+        size = self.size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def rank(self, position: int) -> int:
+        """
+        Returns the number of live positions before position.
+        """
+        tree = self.tree
+        i = min(position, self.size)
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def select(self, rank: int) -> int:
+        """
+        Returns the position of the live row with rank live rows before
+        it, or span if there is none.
+        """
+        if rank >= self.count:
+            return self.size
+        tree = self.tree
+        size = self.size
+        position = 0
+        step = 1 << size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= size and tree[nxt] <= rank:
+                position = nxt
+                rank -= tree[nxt]
+            step >>= 1
+        return position
+
+    def next_live(self, index: int,
+                  count: int) -> Tuple[List[int], int]:
+        """
+        Finds up to count live positions from index onwards.
+
+        Returns:
+            Tuple[List[int], int]: The positions, and the position after
+            the last one, or span if fewer than count were found.
+        """
+        live = self.live
+        size = self.size
+        positions: List[int] = []
+        position = index
+        while len(positions) < count:
+            start = position
+            position = live.find(1, start, min(start + self.SCAN, size))
+            if position < 0:
+                # A long deleted run: jump over it through the tree
+                position = self.select(self.rank(start))
+                if position >= size:
+                    return positions, size
+            if position + 1 < size and live[position + 1]:
+                # Take the whole run of live rows at once
+                end = min(position + count - len(positions), size)
+                gap = live.find(0, position, end)
+                gap = end if gap < 0 else gap
+                positions.extend(range(position, gap))
+                position = gap
+            else:
+                positions.append(position)
+                position += 1
+        return positions, position
+
+    def delete(self, position: int) -> None:
+        """
+        Deletes the row at position.
+
+        Raises:
+            KeyError: If position is not live.
+        """
+        if not (0 <= position < self.size and self.live[position]):
+            raise KeyError(position)
+        self.live[position] = 0
+        self.overrides.pop(position, None)
+        self.count -= 1
+        self._add(position, -1)
+        self.revision += 1
+
+    def insert(self, position: int, row: List) -> None:
+        """
+        Sets the row at position, reviving or appending it if needed.
+
+        Raises:
+            KeyError: If position is negative.
+        """
+        if position < 0:
+            raise KeyError(position)
+        while self.size <= position:
+            self._grow()
+        self.overrides[position] = row
+        if not self.live[position]:
+            self.live[position] = 1
+            self.count += 1
+            self._add(position, 1)
+        self.revision += 1
+
+    def _grow(self) -> None:
+        """
+        Appends one deleted position.
+        """
+        i = self.size + 1
+        # The new node covers (i - lowbit(i), i], all already counted but i
+        self.tree.append(self.rank(i - 1) - self.rank(i - (i & -i)))
+        self.live.append(0)
+        self.size = i
+
+    def row(self, position: int) -> List:
+        """
+        Returns the row at a live position.
+        """
+        row = self.overrides.get(position)
+        return self.dataset[position] if row is None else row
+
+    def rows(self, positions: Sequence[int]) -> List[List]:
+        """
+        Returns the rows at sorted live positions, reading each run of
+        consecutive positions from the dataset with one slice.
+        """
+        dataset = self.dataset
+        overrides = self.overrides
+        end = len(dataset)
+        rows: List[List] = []
+        i = 0
+        while i < len(positions):
+            first = positions[i]
+            j = i + 1
+            while (j < len(positions) and positions[j] == first + j - i and
+                   positions[j] < end):
+                j += 1
+            if first < end:
+                rows.extend(dataset[first:first + j - i])
+            else:
+                rows.append(overrides[first])
+            i = j
+        if overrides:
+            for k, position in enumerate(positions):
+                row = overrides.get(position)
+                if row is not None:
+                    rows[k] = row
+        return rows
+
+    def __getitem__(self, position: int) -> List:
+        if not (isinstance(position, int) and 0 <= position < self.size and
+                self.live[position]):
+            raise KeyError(position)
+        return self.row(position)
+
+    def __setitem__(self, position: int, row: List) -> None:
+        self.insert(position, row)
+
+    def __delitem__(self, position: int) -> None:
+        self.delete(position)
+
+    def __contains__(self, position: object) -> bool:
+        return (isinstance(position, int) and 0 <= position < self.size and
+                self.live[position] == 1)
+
+    def __iter__(self) -> Iterator[int]:
+        live = self.live
+        position = live.find(1)
+        while position >= 0:
+            yield position
+            position = live.find(1, position + 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get(self, position: int, default: Optional[List] = None):
+        """
+        Returns the row at position, or default if it is not live.
+        """
+        if position in self:
+            return self.row(position)
+        return default
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Serves the pagination Servers over HTTP with Flask. Responses carry an
+ETag derived from the dataset version, so clients revalidate with
+If-None-Match and get an empty 304 when nothing changed, and serialized
+page bodies are cached so a repeated page is never rendered twice.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from flask import Flask, Response, request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+
+def dumps(obj) -> bytes:
+    """
+    Serializes obj to compact JSON, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class PageCache:
+    """
+    A bounded LRU cache of serialized response bodies, each stored with
+    the ETag it was rendered for, so a body is reused only while the
+    data behind it is unchanged.
+    """
+
+    def __init__(self, size: int = 1024):
+        """
+        Args:
+            size (int): The most bodies kept, 0 to cache none.
+        """
+        self.size = size
+        self.bodies: "OrderedDict[Tuple, Tuple[str, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple, etag: str, render: Callable) -> bytes:
+        """
+        Returns the body cached under key for etag, or serializes and
+        caches render() in its place.
+        """
+        cached = self.bodies.get(key)
+        if cached is not None and cached[0] == etag:
+            self.bodies.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        body = dumps(render())
+        if self.size:
+            self.bodies[key] = (etag, body)
+            while len(self.bodies) > self.size:
+                self.bodies.popitem(last=False)
+        return body
+
+
+# Create the Flask app
+app = Flask(__name__)
+
+
+class Config:
+    """
+    Configuration class for Flask app.
+    Defines the dataset storage, the page cache size, how long
+    clients may reuse a page of the dataset, and how often rows
+    appended to the data file are picked up (0 never).
+    """
+
+    PAGINATION_STORAGE = os.environ.get("PAGINATION_STORAGE", "list")
+    PAGE_CACHE_SIZE = int(os.environ.get("PAGE_CACHE_SIZE", "1024"))
+    CACHE_MAX_AGE = 60
+    WATCH_INTERVAL = float(os.environ.get("WATCH_INTERVAL", "0"))
+
+
+# Apply the config to the Flask app
+app.config.from_object(Config)
+
+server = Server(app.config["PAGINATION_STORAGE"])
+del_server = DelServer(app.config["PAGINATION_STORAGE"])
+page_cache = PageCache(app.config["PAGE_CACHE_SIZE"])
+# The Servers build their caches lazily and are not thread-safe
+lock = threading.Lock()
+
+# Follow the rows appended to the data file, between requests
+if app.config["WATCH_INTERVAL"] > 0:
+    server.watch(app.config["WATCH_INTERVAL"], lock)
+    del_server.watch(app.config["WATCH_INTERVAL"], lock)
+
+
+def int_arg(name: str, default: Optional[int]) -> Optional[int]:
+    """
+    Returns the integer query parameter name, or default if missing.
+
+    Raises:
+        ValueError: If the parameter is not an integer.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError("{} must be an integer".format(name))
+
+
+def respond(key: Tuple, etag: Callable[[], str], render: Callable,
+            cache_control: str) -> Response:
+    """
+    Returns the JSON body of render(), or an empty 304 if the client
+    already holds the current one.
+
+    Args:
+        key (Tuple): What the body depends on besides the data.
+        etag (Callable): Returns the version of the data.
+        render (Callable): Returns the object to serialize.
+        cache_control (str): The Cache-Control header.
+    """
+    with lock:
+        tag = "{}-{}".format(etag(), "-".join(map(str, key)))
+        if request.if_none_match.contains(tag):
+            response = Response(status=304)
+        else:
+            response = Response(page_cache.get(key, tag, render),
+                                mimetype="application/json")
+    response.set_etag(tag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def dataset_etag() -> str:
+    """
+    The version of the data file and its number of rows, which only
+    grows as Server.refresh appends rows.
+    """
+    return "{}.{}".format(del_server.version(), len(server.dataset()))
+
+
+def live_etag() -> str:
+    """
+    The version of the data file and of the changes made since.
+    """
+    return "{}.{}".format(del_server.version(),
+                          del_server.indexed_dataset().revision)
+
+
+@app.errorhandler(AssertionError)
+@app.errorhandler(ValueError)
+def bad_request(error: Exception) -> Response:
+    """
+    Reports invalid query parameters as a 400 with a JSON message.
+    """
+    return Response(dumps({"error": str(error)}), status=400,
+                    mimetype="application/json")
+
+
+@app.route('/api/v1/pages', strict_slashes=False)
+def get_page() -> Response:
+    """
+    GET /api/v1/pages?page=1&page_size=10
+    Returns the rows of a page, as Server.get_page.
+    """
+    page, page_size = int_arg("page", 1), int_arg("page_size", 10)
+    return respond(
+        ("pages", page, page_size), dataset_etag,
+        lambda: server.get_page(page, page_size),
+        "public, max-age={}".format(app.config["CACHE_MAX_AGE"]))
+
+
+@app.route('/api/v1/hyper', strict_slashes=False)
+def get_hyper() -> Response:
+    """
+    GET /api/v1/hyper?page=1&page_size=10
+    Returns a page with its hypermedia details, as Server.get_hyper.
+    """
+    page, page_size = int_arg("page", 1), int_arg("page_size", 10)
+    return respond(
+        ("hyper", page, page_size), dataset_etag,
+        lambda: server.get_hyper(page, page_size),
+        "public, max-age={}".format(app.config["CACHE_MAX_AGE"]))
+
+
+@app.route('/api/v1/hyper_index', strict_slashes=False)
+def get_hyper_index() -> Response:
+    """
+    GET /api/v1/hyper_index?index=0&page_size=10
+    Returns a deletion-resilient page, as Server.get_hyper_index.
+    Deletions change it, so clients must revalidate it every time.
+    """
+    index, page_size = int_arg("index", 0), int_arg("page_size", 10)
+    return respond(
+        ("hyper_index", index, page_size), live_etag,
+        lambda: del_server.get_hyper_index(index, page_size),
+        "no-cache")
+
+
+if __name__ == '__main__':
+    """
+    Run the app. Starts a development server that listens on all IP addresses
+    (0.0.0.0) and port 5000.
+    """
+    app.run(host='0.0.0.0', port=5000)
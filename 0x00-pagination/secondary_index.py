@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Defines secondary indexes answering filters over the dataset columns.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+from aggregate_views import ethnicity
+
+# Column of each filter answered by a hash index
+COLUMNS = {"year": 0, "gender": 1, "ethnicity": 2}
+# Spellings indexed as one value, as the aggregate views count them
+NORMALIZE = {"ethnicity": ethnicity}
+NAME = 3
+FILTERS = tuple(COLUMNS) + ("name", "prefix")
+
+
+class DatasetIndex:
+    """
+    Posting lists of the positions holding each value: one hash index
+    per categorical column, abbreviated ethnicities indexed under their
+    full spelling, and one for Child's First Name, whose case-folded
+    names are also kept sorted to answer prefix searches.
+    A filter intersects the posting lists of its terms, smallest first,
+    so it never scans the dataset.
+    """
+
+    def __init__(self, dataset: Sequence[List], cache_size: int = 256):
+        """
+        Args:
+            dataset (Sequence[List]): The rows to index.
+            cache_size (int): How many distinct filters keep their
+                matching positions cached.
+        """
+        postings: Dict[str, Dict[str, array]] = {
+            column: {} for column in COLUMNS}
+        names: Dict[str, array] = {}
+        for position, row in enumerate(dataset[:]):
+            for column, field in COLUMNS.items():
+                value = row[field]
+                if column in NORMALIZE:
+                    value = NORMALIZE[column](value)
+                posting = postings[column].get(value)
+                if posting is None:
+                    posting = postings[column][value] = array("I")
+                posting.append(position)
+            key = row[NAME].casefold()
+            posting = names.get(key)
+            if posting is None:
+                posting = names[key] = array("I")
+            posting.append(position)
+        self.size = len(dataset)
+        self.postings = postings
+        self.names = names
+        self.sorted_names = sorted(names)
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def values(self, column: str) -> List[str]:
+        """
+        Returns the distinct values of a categorical column.
+        """
+        return sorted(self.postings[column])
+
+    def prefixed(self, prefix: str) -> List[str]:
+        """
+        Returns the case-folded names starting with prefix.
+        """
+        prefix = prefix.casefold()
+        start = bisect_left(self.sorted_names, prefix)
+        end = start
+        while (end < len(self.sorted_names) and
+               self.sorted_names[end].startswith(prefix)):
+            end += 1
+        return self.sorted_names[start:end]
+
+    def posting(self, column: str, value: str) -> Sequence[int]:
+        """
+        Returns the sorted positions where column holds value.
+
+        Raises:
+            ValueError: If column cannot be filtered on.
+        """
+        empty = array("I")
+        if column in COLUMNS:
+            value = str(value)
+            if column in NORMALIZE:
+                value = NORMALIZE[column](value)
+            return self.postings[column].get(value, empty)
+        if column == "name":
+            return self.names.get(value.casefold(), empty)
+        if column == "prefix":
+            matches = [self.names[name] for name in self.prefixed(value)]
+            if len(matches) == 1:
+                return matches[0]
+            return array("I", sorted(chain.from_iterable(matches)))
+        raise ValueError("unknown filter: {}".format(column))
+
+    def filter(self, **filters: str) -> Sequence[int]:
+        """
+        Returns the sorted positions matching every filter, from year,
+        gender, ethnicity, name (case-insensitive) and prefix (of the
+        name, case-insensitive). Results are cached per filter.
+
+        Raises:
+            ValueError: If a filter is unknown.
+        """
+        return self._cached_match(tuple(sorted(
+            (column, str(value)) for column, value in filters.items())))
+
+    def _match(self, terms: Tuple[Tuple[str, str], ...]) -> Sequence[int]:
+        """
+        Intersects the posting lists of terms.
+        """
+        if not terms:
+            return range(self.size)
+        postings = sorted((self.posting(column, value)
+                           for column, value in terms), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            result = _intersect(result, posting)
+        return result
+
+
+def _intersect(small: Sequence[int], large: Sequence[int]) -> array:
+    """
+    Intersects two sorted posting lists: a much smaller one by binary
+    searches in the larger one, otherwise through a set.
+    """
+    if not small:
+        return array("I")
+    # Rows are clustered by year, so the overlap is often a narrow range
+    large = large[bisect_left(large, small[0]):
+                  bisect_right(large, small[-1])]
+    if len(small) * 16 >= len(large):
+        return array("I", sorted(set(small).intersection(large)))
+    result = array("I")
+    lo = 0
+    end = len(large)
+    for position in small:
+        lo = bisect_left(large, position, lo)
+        if lo == end:
+            break
+        if large[lo] == position:
+            result.append(position)
+    return result
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Main file: ShardedServer against the single-process Servers
+"""
+
+import random
+from collections import Counter
+
+from sharded_server import ShardedServer
+
+Server = __import__('2-hypermedia_pagination').Server
+DelServer = __import__('3-hypermedia_del_pagination').Server
+
+if __name__ == "__main__":
+    # Workers may be spawned, re-importing this file
+    server, del_server = Server(), DelServer()
+    rows = server.dataset()
+    rng = random.Random(0)
+    with ShardedServer(3) as sharded:
+        for page, page_size in [(1, 10), (646, 10), (647, 10), (3, 6473),
+                                (1, 20000), (20000, 1)] + [
+                (rng.randint(1, 2000), rng.randint(1, 50))
+                for _ in range(100)]:
+            assert sharded.get_page(page, page_size) == \
+                server.get_page(page, page_size), (page, page_size)
+
+        # Deleting whole shard boundaries makes pages span shards
+        for index in list(range(6465, 6480)) + rng.sample(range(19418), 500):
+            if index in del_server.indexed_dataset():
+                sharded.delete(index)
+                del_server.delete(index)
+        for index in [0, 6464, 6470, 12940] + rng.sample(range(19418), 100):
+            assert sharded.get_hyper_index(index, 25) == \
+                del_server.get_hyper_index(index, 25), index
+        print(sharded.get_hyper_index(6464, 3)["next_index"])
+
+        live = [row for index, row in enumerate(rows)
+                if index in del_server.indexed_dataset()]
+        years = Counter()
+        for row in live:
+            years[row[0], row[1]] += int(row[4])
+        assert sharded.aggregate(("year", "gender")) == years
+        assert sum(sharded.aggregate("name", None).values()) == len(live)
+        print(sharded.aggregate("name")["Olivia"])
+        # Groups every spelling together, as the aggregate views do
+        views = del_server.views()
+        for column in ("name", "year", "ethnicity"):
+            assert sharded.aggregate(column) == views.totals[column].totals
+        print(sorted(sharded.aggregate("ethnicity", None).items()))
+
+        try:
+            sharded.delete(6470)
+        except KeyError as e:
+            print("KeyError {}".format(e))
+        for by, value in (("nope", "count"), ("year", "gender")):
+            try:
+                sharded.aggregate(by, value)
+            except ValueError as e:
+                print("ValueError {}".format(e))
+        # An error from every shard leaves no reply unread
+        try:
+            sharded._call([(shard, ("page", "a", 1)) for shard in range(3)])
+        except TypeError:
+            print("TypeError from the workers")
+        assert sharded.get_page(2, 5) == server.get_page(2, 5)
+        assert sharded.get_hyper_index(0, 5) == \
+            del_server.get_hyper_index(0, 5)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Defines a Server partitioning the dataset across worker processes.
+"""
+
+import multiprocessing
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from aggregate_views import ethnicity
+from dataset_storage import load_dataset
+from live_index import LiveIndex
+
+index_range = __import__('0-simple_helper_function').index_range
+
+# Field of each column rows can be grouped by
+COLUMNS = {"year": 0, "gender": 1, "ethnicity": 2, "name": 3, "count": 4,
+           "rank": 5}
+# The columns holding integers, which can be summed
+NUMERIC = ("year", "count", "rank")
+# How values are grouped, as by aggregate_views.group_keys: names
+# title-cased and ethnicities unabbreviated
+NORMALIZE = {COLUMNS["name"]: str.title, COLUMNS["ethnicity"]: ethnicity}
+
+
+class Shard:
+    """
+    The rows from lo to hi (excluded), held by one worker process, with
+    a LiveIndex of its own for deletions. Positions are local.
+    """
+
+    def __init__(self, path: str, storage: str, lo: int, hi: int):
+        self.rows = load_dataset(path, storage)[lo:hi]
+        self.index = LiveIndex(self.rows)
+
+    def page(self, start: int, end: int) -> List[List]:
+        """
+        Returns the rows from start to end (excluded).
+        """
+        return self.rows[start:end]
+
+    def next_live(self, start: int, count: int) -> Tuple[List[List], int]:
+        """
+        Returns up to count live rows from start, and the position
+        after the last one (see LiveIndex.next_live).
+        """
+        positions, next_index = self.index.next_live(start, count)
+        return self.index.rows(positions), next_index
+
+    def delete(self, position: int) -> None:
+        """
+        Deletes the row at position.
+        """
+        self.index.delete(position)
+
+    def aggregate(self, by: Tuple[int, ...],
+                  value: Optional[int]) -> Counter:
+        """
+        Sums field value (or counts rows if None) of the live rows,
+        grouped by the fields of by. Every spelling of a group adds up
+        together (see NORMALIZE), so "OLIVIA" and "Olivia" do.
+        """
+        totals: Counter = Counter()
+        rows = self.rows
+        live = self.index.live
+        fields = [(field, NORMALIZE.get(field)) for field in by]
+        for position, row in enumerate(rows):
+            if not live[position]:
+                continue
+            key = tuple(row[field] if normalize is None
+                        else normalize(row[field])
+                        for field, normalize in fields)
+            totals[key] += 1 if value is None else int(row[value])
+        return totals
+
+
+def serve_shard(conn, path: str, storage: str, lo: int, hi: int) -> None:
+    """
+    Worker process loop: loads its shard, then answers (method, *args)
+    requests with (ok, result) until it receives None.
+    """
+    shard = Shard(path, storage, lo, hi)
+    conn.send((True, len(shard.rows)))
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        name, *args = request
+        try:
+            conn.send((True, getattr(shard, name)(*args)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class ShardedServer:
+    """
+    Paginates the popular baby names dataset with its rows split into
+    contiguous ranges, each owned by a worker process. Page requests go
+    to the shards whose range they overlap; aggregations run on every
+    shard at once and their partial results are merged.
+    """
+    DATA_FILE = "Popular_Baby_Names.csv"
+
+    def __init__(self, workers: int = 4, storage: str = "snapshot",
+                 data_file: Optional[str] = None):
+        """
+        Args:
+            workers (int): The number of worker processes and shards.
+            storage (str): How each worker loads its rows (see
+                dataset_storage.load_dataset). "snapshot" and "mmap"
+                let a worker parse only its own range.
+            data_file (str): The CSV file, DATA_FILE by default.
+        """
+        path = data_file or self.DATA_FILE
+        # Also writes the snapshot or offset index the workers reuse
+        self.total = len(load_dataset(path, storage))
+        workers = max(1, min(workers, self.total or 1))
+        self.bounds = [self.total * i // workers for i in range(workers + 1)]
+        context = multiprocessing.get_context()
+        self.conns = []
+        self.processes = []
+        for lo, hi in zip(self.bounds, self.bounds[1:]):
+            conn, child = context.Pipe()
+            process = context.Process(
+                target=serve_shard, args=(child, path, storage, lo, hi),
+                daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+        self._receive(self.conns)
+
+    @staticmethod
+    def _receive(conns: Sequence) -> List:
+        """
+        Returns the result of each worker in order. Every reply is read
+        before the first error is raised, so no pipe is left with an
+        unread reply for the next call.
+        """
+        replies = [conn.recv() for conn in conns]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def _call(self, requests: Sequence[Tuple[int, Tuple]]) -> List:
+        """
+        Sends every (shard, request) pair, then collects the results in
+        order, so the shards work in parallel.
+        """
+        for shard, request in requests:
+            self.conns[shard].send(request)
+        return self._receive([self.conns[shard] for shard, _ in requests])
+
+    def shard_of(self, index: int) -> int:
+        """
+        Returns the shard owning the row at index.
+        """
+        lo, hi = 0, len(self.conns)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if self.bounds[mid] <= index:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def get_page(self, page: int = 1, page_size: int = 10) -> List[List]:
+        """
+        Returns a page of the dataset, gathered from the shards owning
+        its index range.
+
+        Raises:
+            AssertionError: If page or page_size are not positive integers.
+        """
+        assert (
+            isinstance(page, int) and page > 0
+        ), "page must be a positive integer"
+        assert (
+            isinstance(page_size, int) and page_size > 0
+        ), "page_size must be a positive integer"
+
+        start_index, end_index = index_range(page, page_size)
+        end_index = min(end_index, self.total)
+        if start_index >= end_index:
+            return []
+        requests = []
+        for shard in range(self.shard_of(start_index),
+                           self.shard_of(end_index - 1) + 1):
+            lo = self.bounds[shard]
+            requests.append((shard, (
+                "page", max(start_index, lo) - lo, end_index - lo)))
+        return [row for rows in self._call(requests) for row in rows]
+
+    def get_hyper_index(self, index: int = None, page_size: int = 10) -> Dict:
+        """
+        Returns a dictionary containing deletion-resilient hypermedia
+        pagination details, continuing into the following shards when
+        the owning shard runs out of live rows.
+
+        Raises:
+            AssertionError: If index is not a valid position in the dataset.
+        """
+        assert (
+            isinstance(index, int)
+            and 0 <= index < self.total
+        ), "Index out of range"
+
+        data: List[List] = []
+        shard = self.shard_of(index)
+        start = index
+        next_index = self.total
+        while len(data) < page_size and shard < len(self.conns):
+            lo = self.bounds[shard]
+            rows, local_next = self._call([(shard, (
+                "next_live", start - lo, page_size - len(data)))])[0]
+            data.extend(rows)
+            next_index = lo + local_next
+            shard += 1
+            start = self.bounds[shard] if shard < len(self.conns) else 0
+
+        return {
+            "index": index,
+            "data": data,
+            "page_size": len(data),
+            "next_index": next_index,
+        }
+
+    def delete(self, index: int) -> None:
+        """
+        Deletes the row at index in its shard.
+
+        Raises:
+            KeyError: If there is no row at index.
+        """
+        if not 0 <= index < self.total:
+            raise KeyError(index)
+        shard = self.shard_of(index)
+        self._call([(shard, ("delete", index - self.bounds[shard]))])
+
+    def aggregate(self, by: Union[str, Sequence[str]] = "name",
+                  value: Optional[str] = "count") -> Dict:
+        """
+        Sums a column over the live rows grouped by one or more
+        columns, each shard summing its own rows in parallel.
+
+        Args:
+            by (str): A column, or a sequence of columns, to group by.
+            value (str): The column to sum, one of NUMERIC, or None to
+                count rows.
+
+        Returns:
+            Dict: The total of each group, keyed by the column value,
+            or by a tuple of values when grouping by several columns.
+
+        Raises:
+            ValueError: If a column is unknown, or value is not numeric.
+        """
+        columns = (by,) if isinstance(by, str) else tuple(by)
+        for column in columns:
+            if column not in COLUMNS:
+                raise ValueError("unknown column: {}".format(column))
+        if value is not None and value not in NUMERIC:
+            raise ValueError("cannot sum column: {}".format(value))
+        request = ("aggregate", tuple(COLUMNS[column] for column in columns),
+                   COLUMNS[value] if value else None)
+        totals: Counter = Counter()
+        for partial in self._call(
+                [(shard, request) for shard in range(len(self.conns))]):
+            totals.update(partial)
+        if isinstance(by, str):
+            return {key[0]: total for key, total in totals.items()}
+        return dict(totals)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join()
+        for conn in self.conns:
+            conn.close()
+        self.conns = []
+
+    def __enter__(self) -> "ShardedServer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
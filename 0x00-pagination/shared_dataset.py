@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Publishes the parsed dataset in shared memory, for worker processes to
+attach to without parsing or copying it.
+"""
+
+import mmap
+import os
+import tempfile
+from typing import Dict
+
+from columnar_dataset import ColumnarDataset
+from dataset_snapshot import pack_snapshot, snapshot_dataset, unpack_snapshot
+
+# Where blocks are published: the RAM-backed tmpfs when there is one
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Blocks mapped by this process, kept open while their columns are used
+_ATTACHED: Dict[str, mmap.mmap] = {}
+
+
+def shared_path(path: str) -> str:
+    """
+    Returns the path of the block holding the CSV file path. It is
+    derived from the size, mtime and inode of the file, which every
+    process can stat without reading it, so a changed file is never
+    served from the block of its previous contents.
+    """
+    stat = os.stat(path)
+    return os.path.join(SHARED_DIR, "bnames-{:x}-{:x}-{:x}".format(
+        stat.st_size, stat.st_mtime_ns, stat.st_ino))
+
+
+def publish_dataset(path: str) -> str:
+    """
+    Parses the CSV file path into a block of shared memory, in the
+    snapshot layout, and returns the path of the block. The block is
+    written aside then renamed, so a worker never maps it half written.
+    The caller owns it, and removes it with unpublish_dataset.
+
+    Args:
+        path (str): The CSV file, with a header row.
+    """
+    block = shared_path(path)
+    partial = "{}.{}.tmp".format(block, os.getpid())
+    try:
+        with open(partial, "wb") as f:
+            for chunk in pack_snapshot(ColumnarDataset.from_csv(path)):
+                f.write(chunk)
+        os.replace(partial, block)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+    return block
+
+
+def unpublish_dataset(path: str) -> None:
+    """
+    Removes the block published for the CSV file path, if any. Workers
+    still attached keep their mapping until they exit.
+    """
+    try:
+        os.unlink(shared_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def attach_dataset(block: str, verify: bool = False) -> ColumnarDataset:
+    """
+    Maps a published block read-only and serves its columns without
+    copying them. The block stays mapped until the process exits.
+
+    Args:
+        block (str): The path of the block.
+        verify (bool): Whether to check the crc32 of the contents.
+
+    Raises:
+        FileNotFoundError: If no block is published there.
+        ValueError: If the block does not hold a dataset.
+    """
+    mapped = _ATTACHED.get(block)
+    if mapped is None:
+        with open(block, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _ATTACHED[block] = mapped
+    dataset = unpack_snapshot(memoryview(mapped), verify=verify)
+    if dataset is None:
+        raise ValueError("not a published dataset: {}".format(block))
+    return dataset
+
+
+def shared_dataset(path: str) -> ColumnarDataset:
+    """
+    Attaches to the published dataset of the CSV file path, or falls
+    back to its snapshot file, mapped just as cheaply, if none is.
+    """
+    try:
+        return attach_dataset(shared_path(path))
+    except FileNotFoundError:
+        return snapshot_dataset(path)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Defines lazily built, cached sort orders over the dataset rows.
+"""
+
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from columnar_dataset import ColumnarDataset
+
+# Field of each sortable column, and whether its values are integers
+COLUMNS = {"year": (0, True), "name": (3, False), "count": (4, True),
+           "rank": (5, True)}
+
+
+def parse_order(order_by: str) -> Tuple[str, bool]:
+    """
+    Splits an order such as "rank" or "-count" into its column and
+    whether it is descending.
+
+    Raises:
+        ValueError: If the column cannot be sorted on.
+    """
+    column = order_by[1:] if order_by.startswith("-") else order_by
+    if column not in COLUMNS:
+        raise ValueError("unknown order: {}".format(order_by))
+    return column, order_by.startswith("-")
+
+
+class SortOrders:
+    """
+    Permutations of the dataset positions, one per order, each built
+    the first time the order is requested and kept, so a sorted page is
+    a slice of positions rather than a sort. Rows with equal keys keep
+    their file order.
+    """
+
+    def __init__(self, dataset: Sequence[List]):
+        """
+        Args:
+            dataset (Sequence[List]): The rows to sort.
+        """
+        self.dataset = dataset
+        self.permutations: Dict[str, array] = {}
+
+    def keys(self, column: str) -> Sequence:
+        """
+        Returns the value of column in every row. Names are casefolded,
+        since the file spells some in capitals ("OLIVIA" and "Olivia"),
+        so they sort as the name index matches them.
+        """
+        dataset = self.dataset
+        if isinstance(dataset, ColumnarDataset):
+            if column == "name":
+                values = [value.casefold() for value in dataset.names.values]
+                return [values[code] for code in dataset.names.codes]
+            return {"year": dataset.years, "count": dataset.counts,
+                    "rank": dataset.ranks}[column]
+        field, numeric = COLUMNS[column]
+        rows = dataset[:]
+        if numeric:
+            return [int(row[field]) for row in rows]
+        return [row[field].casefold() for row in rows]
+
+    def permutation(self, order_by: str) -> array:
+        """
+        Returns the dataset positions sorted by order_by, a column
+        among year, name, count and rank, descending if prefixed by "-".
+
+        Raises:
+            ValueError: If order_by is unknown.
+        """
+        permutation = self.permutations.get(order_by)
+        if permutation is None:
+            column, descending = parse_order(order_by)
+            keys = self.keys(column)
+            # sorted is stable, reverse included: ties keep file order
+            permutation = array("I", sorted(
+                range(len(keys)), key=keys.__getitem__, reverse=descending))
+            self.permutations[order_by] = permutation
+        return permutation
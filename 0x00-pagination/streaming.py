@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Writes streams of dataset rows as CSV or NDJSON, one row at a time.
+"""
+
+import csv
+import json
+from typing import IO, Iterable, List, Sequence
+
+FIELDS = ("Year of Birth", "Gender", "Ethnicity", "Child's First Name",
+          "Count", "Rank")
+
+
+def write_csv(rows: Iterable[List], f: IO[str],
+              header: Sequence[str] = FIELDS) -> int:
+    """
+    Writes header, unless empty, then every row to f as CSV.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writer = csv.writer(f)
+    if header:
+        writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_ndjson(rows: Iterable[List], f: IO[str],
+                 fields: Sequence[str] = FIELDS) -> int:
+    """
+    Writes every row to f as one JSON object per line, keyed by fields.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    for row in rows:
+        f.write(json.dumps(dict(zip(fields, row))))
+        f.write("\n")
+        count += 1
+    return count
@@ -7,16 +7,7 @@ from base_caching import BaseCaching
 
 class BasicCache(BaseCaching):
     """ BasicCache class
-        A caching system without limit.
+        A caching system without limit, unless a max_items or
+        max_bytes capacity is given to the instance.
     """
-
-    def put(self, key, item):
-        """ Add an item in the cache
-        """
-        if key is not None and item is not None:
-            self.cache_data[key] = item
-
-    def get(self, key):
-        """ Get an item by key
-        """
-        return self.cache_data.get(key, None)
+    MAX_ITEMS = None
@@ -3,34 +3,37 @@
 """
 
 from base_caching import BaseCaching
+from collections import OrderedDict
 
 
 class FIFOCache(BaseCaching):
     """ FIFOCache class
         A caching system using the FIFO algorithm.
     """
+    BATCH_EVICTION = True
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """ Initialize the FIFOCache
         """
-        super().__init__()
-        self.order = []  # To keep track of the insertion order
+        super().__init__(**kwargs)
+        self.order = OrderedDict()  # To keep track of the insertion order
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def _on_insert(self, key):
+        """ Queue a new key last
         """
-        if key is not None and item is not None:
-            if key in self.cache_data:
-                self.order.remove(key)
-            elif len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # FIFO: Remove the first item
-                discarded_key = self.order.pop(0)
-                del self.cache_data[discarded_key]
-                print(f"DISCARD: {discarded_key}")
-            self.cache_data[key] = item
-            self.order.append(key)
-
-    def get(self, key):
-        """ Get an item by key
+        self.order[key] = None
+
+    def _on_update(self, key):
+        """ A replaced item is queued again as if newly inserted
+        """
+        self.order.move_to_end(key)
+
+    def _on_remove(self, key):
+        """ Drop key from the queue
+        """
+        del self.order[key]
+
+    def _victim(self):
+        """ FIFO: the first inserted key
         """
-        return self.cache_data.get(key, None)
+        return next(iter(self.order))
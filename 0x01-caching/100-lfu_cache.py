@@ -3,60 +3,58 @@
 """
 
 from base_caching import BaseCaching
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 
 class LFUCache(BaseCaching):
     """ LFUCache class
         A caching system using the LFU (Least Frequently Used) algorithm.
+        Keys are grouped in frequency buckets, each an OrderedDict kept
+        in LRU order, and the lowest non-empty frequency is tracked so
+        every operation is O(1).
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """ Initialize the LFUCache
         """
-        super().__init__()
-        self.frequency = defaultdict(int)  # Tracks frequency of keys
-        self.order = defaultdict(list)  # Tracks keys in order of use
-        self.key_to_time = {}  # Tracks the time keys were last used
+        super().__init__(**kwargs)
+        self.frequency = {}  # Tracks frequency of keys
+        self.buckets = defaultdict(OrderedDict)  # frequency -> LRU keys
+        self.min_freq = 0  # Lowest frequency present in the cache
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def _on_insert(self, key):
+        """ A new key starts at frequency 1
         """
-        if key is None or item is None:
-            return
-
-        if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-            # Find the least frequently used key (LFU)
-            min_freq = min(self.frequency.values(), default=None)
-            lfu_keys = [k for k, v in self.frequency.items() if v == min_freq]
-
-            # If there are multiple keys with the same frequency, apply LRU
-            if len(lfu_keys) > 1:
-                lru_key = min(lfu_keys, key=lambda k: self.key_to_time[k])
-                del self.cache_data[lru_key]
-                del self.frequency[lru_key]
-                del self.key_to_time[lru_key]
-                print(f"DISCARD: {lru_key}")
-            else:
-                lfu_key = lfu_keys[0]
-                del self.cache_data[lfu_key]
-                del self.frequency[lfu_key]
-                del self.key_to_time[lfu_key]
-                print(f"DISCARD: {lfu_key}")
-
-        # Add the new key
-        self.cache_data[key] = item
         self.frequency[key] = 1
-        self.order[key] = [key]
-        self.key_to_time[key] = len(self.key_to_time)  # Update time stamp
+        self.buckets[1][key] = None
+        self.min_freq = 1
 
-    def get(self, key):
-        """ Get an item by key
+    def _on_access(self, key):
+        """ Move a key to the next frequency bucket
         """
-        if key is None or key not in self.cache_data:
-            return None
-
-        # Update the frequency and time of last use
-        self.frequency[key] += 1
-        self.key_to_time[key] = len(self.key_to_time)
-        return self.cache_data[key]
+        freq = self.frequency[key]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.frequency[key] = freq + 1
+        self.buckets[freq + 1][key] = None
+
+    def _on_remove(self, key):
+        """ Drop key from its frequency bucket
+        """
+        freq = self.frequency.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+
+    def _victim(self):
+        """ Least frequently used key, ties broken by LRU
+        """
+        if self.min_freq not in self.buckets:
+            # Only after a removal other than an eviction emptied it
+            self.min_freq = min(self.buckets)
+        return next(iter(self.buckets[self.min_freq]))
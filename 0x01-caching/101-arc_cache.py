@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+""" ARCCache module
+"""
+
+from base_caching import BaseCaching
+from collections import OrderedDict
+
+
+class ARCCache(BaseCaching):
+    """ ARCCache class
+        A caching system using the ARC (Adaptive Replacement Cache)
+        algorithm. Keys seen once live in t1 and keys seen again in t2;
+        the ghost lists b1 and b2 remember recently evicted keys and
+        steer the target size p of t1, so a one-time scan only flushes
+        t1 and leaves the frequently used keys of t2 in place.
+    """
+
+    def __init__(self, **kwargs):
+        """ Initialize the ARCCache
+        """
+        super().__init__(**kwargs)
+        self.t1 = OrderedDict()  # Resident, seen once, LRU first
+        self.t2 = OrderedDict()  # Resident, seen at least twice
+        self.b1 = OrderedDict()  # Ghosts evicted from t1
+        self.b2 = OrderedDict()  # Ghosts evicted from t2
+        self.p = 0  # Target size of t1
+        self.incoming = None  # Key being admitted
+
+    def _capacity(self):
+        """ Number of resident keys ARC adapts to
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return len(self.cache_data) + 1
+
+    def _on_admit(self, key):
+        """ Adapt p on a ghost hit, or trim the ghost directory
+        """
+        c = self._capacity()
+        if key in self.b1:
+            delta = max(len(self.b2) / len(self.b1), 1)
+            self.p = min(c, self.p + delta)
+        elif key in self.b2:
+            delta = max(len(self.b1) / len(self.b2), 1)
+            self.p = max(0, self.p - delta)
+        elif len(self.t1) + len(self.b1) >= c:
+            if self.b1:
+                self.b1.popitem(last=False)
+        elif (len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >=
+              2 * c and self.b2):
+            self.b2.popitem(last=False)
+        self.incoming = key
+
+    def _on_insert(self, key):
+        """ A ghost hit goes to t2, a brand new key to t1
+        """
+        if key in self.b1:
+            del self.b1[key]
+            self.t2[key] = None
+        elif key in self.b2:
+            del self.b2[key]
+            self.t2[key] = None
+        else:
+            self.t1[key] = None
+        self.incoming = None
+
+    def _on_access(self, key):
+        """ A hit makes key the most recent entry of t2
+        """
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = None
+        else:
+            self.t2.move_to_end(key)
+
+    def _on_remove(self, key):
+        """ Drop key from the resident lists
+        """
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+
+    def _victim(self):
+        """ ARC REPLACE: the LRU of t1 if t1 exceeds its target, else
+            the LRU of t2
+        """
+        t1_len = len(self.t1)
+        if self.t1 and (not self.t2 or t1_len > self.p or
+                        (self.incoming in self.b2 and t1_len == self.p)):
+            return next(iter(self.t1))
+        return next(iter(self.t2))
+
+    def _discard(self, key):
+        """ Evict key and remember it in the matching ghost list
+        """
+        ghost = self.b1 if key in self.t1 else self.b2
+        super()._discard(key)
+        ghost[key] = None
+        if len(self.b1) + len(self.b2) > self._capacity():
+            # Byte budgets can evict several keys per admission. The
+            # ghost of the key being admitted is kept for _on_insert
+            lists = ((self.b1, self.b2) if len(self.b1) > len(self.b2)
+                     else (self.b2, self.b1))
+            for ghosts in lists:
+                oldest = next((ghost for ghost in ghosts
+                               if ghost != self.incoming), None)
+                if oldest is not None:
+                    del ghosts[oldest]
+                    return
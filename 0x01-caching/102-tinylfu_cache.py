@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+""" TinyLFUCache module
+"""
+
+from base_caching import BaseCaching
+from collections import OrderedDict
+
+
+class CountMinSketch():
+    """ CountMinSketch class
+        Approximate access frequencies in depth rows of small counters.
+        Every counter is halved once sample_size increments were
+        recorded, so old popularity fades away.
+    """
+    SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+    MAX_COUNT = 15
+    HALVED = bytes(count >> 1 for count in range(256))
+
+    def __init__(self, width, sample_size):
+        """ Initialize width counters per row
+        """
+        width = 1 << max(4, (width - 1).bit_length())
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in self.SEEDS]
+        self.sample_size = sample_size
+        self.additions = 0
+
+    def _indexes(self, key):
+        """ Counter index of key in each row
+        """
+        h = hash(key)
+        return [((h ^ seed) * 0x9E3779B97F4A7C15 >> 32) & self.mask
+                for seed in self.SEEDS]
+
+    def increment(self, key):
+        """ Record one access of key
+        """
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key):
+        """ Estimated access count of key
+        """
+        return min(row[index]
+                   for row, index in zip(self.rows, self._indexes(key)))
+
+    def _reset(self):
+        """ Age every counter by halving it
+        """
+        for row in self.rows:
+            row[:] = row.translate(self.HALVED)
+        self.additions //= 2
+
+
+class TinyLFUCache(BaseCaching):
+    """ TinyLFUCache class
+        A caching system using the W-TinyLFU algorithm: new keys enter
+        a small window LRU, and a key leaving the window only replaces
+        the victim of the main segmented LRU (probation + protected) if
+        the count-min sketch says it is used more often.
+    """
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self, **kwargs):
+        """ Initialize the TinyLFUCache
+        """
+        super().__init__(**kwargs)
+        capacity = self.max_items if self.max_items is not None else 256
+        self.sketch = CountMinSketch(4 * capacity, 10 * capacity)
+        self.window = OrderedDict()  # Admission window, LRU first
+        self.probation = OrderedDict()  # Main segment, seen once there
+        self.protected = OrderedDict()  # Main segment, hit while there
+
+    def _capacity(self):
+        """ Number of resident keys the segments are sized for
+        """
+        if self.max_items is not None:
+            return self.max_items
+        return len(self.cache_data) + 1
+
+    def _on_admit(self, key):
+        """ Record the access that missed
+        """
+        self.sketch.increment(key)
+
+    def _on_insert(self, key):
+        """ New keys always enter the window, which spills into
+            probation while the cache is still filling up
+        """
+        self.window[key] = None
+        max_window = max(1, int(self._capacity() * self.WINDOW_RATIO))
+        while len(self.window) > max_window:
+            spilled, _ = self.window.popitem(last=False)
+            self.probation[spilled] = None
+
+    def _on_access(self, key):
+        """ Record the access and promote key within its segment
+        """
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+        elif key in self.protected:
+            self.protected.move_to_end(key)
+        else:
+            del self.probation[key]
+            self.protected[key] = None
+            max_protected = int(self._capacity() * self.PROTECTED_RATIO)
+            if len(self.protected) > max(1, max_protected):
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+
+    def _on_remove(self, key):
+        """ Drop key from its segment
+        """
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def _victim(self):
+        """ The window LRU competes with the main victim on frequency
+        """
+        main = self.probation or self.protected
+        if not main:
+            return next(iter(self.window))
+        main_victim = next(iter(main))
+        max_window = max(1, int(self._capacity() * self.WINDOW_RATIO))
+        if len(self.window) < max_window:
+            return main_victim
+        candidate = next(iter(self.window))
+        if (self.sketch.estimate(candidate) >
+                self.sketch.estimate(main_victim)):
+            # Admitted: the candidate moves to the main segment
+            del self.window[candidate]
+            self.probation[candidate] = None
+            return main_victim
+        return candidate
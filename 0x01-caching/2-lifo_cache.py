@@ -3,6 +3,7 @@
 """
 
 from base_caching import BaseCaching
+from collections import OrderedDict
 
 
 class LIFOCache(BaseCaching):
@@ -10,25 +11,28 @@ class LIFOCache(BaseCaching):
         A caching system using the LIFO algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """ Initialize the LIFOCache
         """
-        super().__init__()
-        self.last_key = None  # To track the last inserted key
+        super().__init__(**kwargs)
+        self.order = OrderedDict()  # Insertion order, last key on top
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def _on_insert(self, key):
+        """ Push a new key on top
         """
-        if key is not None and item is not None:
-            if (len(self.cache_data) >= BaseCaching.MAX_ITEMS and
-               key not in self.cache_data):
-                if self.last_key is not None:
-                    del self.cache_data[self.last_key]
-                    print(f"DISCARD: {self.last_key}")
-            self.cache_data[key] = item
-            self.last_key = key
-
-    def get(self, key):
-        """ Get an item by key
+        self.order[key] = None
+
+    def _on_update(self, key):
+        """ A replaced item becomes the last inserted key
+        """
+        self.order.move_to_end(key)
+
+    def _on_remove(self, key):
+        """ Drop key from the stack
+        """
+        del self.order[key]
+
+    def _victim(self):
+        """ LIFO: the last inserted key
         """
-        return self.cache_data.get(key, None)
+        return next(reversed(self.order))
@@ -3,41 +3,39 @@
 """
 
 from base_caching import BaseCaching
+from collections import OrderedDict
 
 
 class LRUCache(BaseCaching):
     """ LRUCache class
         A caching system using the LRU (Least Recently Used) algorithm.
+        Recency is tracked in an OrderedDict so promotion and eviction
+        are both O(1).
     """
+    BATCH_EVICTION = True
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """ Initialize the LRUCache
         """
-        super().__init__()
-        self.order = []  # To keep track of the access order
+        super().__init__(**kwargs)
+        self.order = OrderedDict()  # Oldest (LRU) first, newest last
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def _on_insert(self, key):
+        """ Mark a new key as recently used
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # If the cache exceeds the max limit, remove the least
-                # recently used item
-                lru_key = self.order.pop(0)  # Remove the first element (LRU)
-                del self.cache_data[lru_key]
-                print(f"DISCARD: {lru_key}")
-
-            self.cache_data[key] = item
-            self.order.append(key)  # Mark this key as recently used
-
-    def get(self, key):
-        """ Get an item by key
+        self.order[key] = None
+
+    def _on_access(self, key):
+        """ Move the accessed key to the end of the order (recently used)
         """
-        if key is None or key not in self.cache_data:
-            return None
+        self.order.move_to_end(key)
 
-        # Move the accessed key to the end of the order (recently used)
-        self.order.remove(key)
-        self.order.append(key)
+    def _on_remove(self, key):
+        """ Forget the recency of key
+        """
+        del self.order[key]
 
-        return self.cache_data[key]
+    def _victim(self):
+        """ LRU: the least recently used key
+        """
+        return next(iter(self.order))
@@ -3,6 +3,7 @@
 """
 
 from base_caching import BaseCaching
+from collections import OrderedDict
 
 
 class MRUCache(BaseCaching):
@@ -10,34 +11,28 @@ class MRUCache(BaseCaching):
         A caching system using the MRU (Most Recently Used) algorithm.
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """ Initialize the MRUCache
         """
-        super().__init__()
+        super().__init__(**kwargs)
+        self.order = OrderedDict()  # Oldest first, most recently used last
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def _on_insert(self, key):
+        """ Mark a new key as most recently used
         """
-        if key is not None and item is not None:
-            if len(self.cache_data) >= BaseCaching.MAX_ITEMS:
-                # If the cache exceeds the max limit, remove the
-                # most recently used item
-                # Get the last inserted key
-                mru_key = list(self.cache_data.keys())[-1]
-                del self.cache_data[mru_key]
-                print(f"DISCARD: {mru_key}")
-
-            self.cache_data[key] = item
-
-    def get(self, key):
-        """ Get an item by key
+        self.order[key] = None
+
+    def _on_access(self, key):
+        """ Move the accessed key to the end (most recently used)
         """
-        if key is None or key not in self.cache_data:
-            return None
+        self.order.move_to_end(key)
 
-        # Move the accessed key to the end (most recently used)
-        item = self.cache_data[key]
-        del self.cache_data[key]
-        self.cache_data[key] = item
+    def _on_remove(self, key):
+        """ Forget the recency of key
+        """
+        del self.order[key]
 
-        return item
+    def _victim(self):
+        """ MRU: the most recently used key
+        """
+        return next(reversed(self.order))
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+""" 5-main: time-to-live of entries, on a clock moved by hand """
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+class Clock():
+    """ Clock defines:
+      - the time in seconds, advanced by calling tick
+    """
+
+    def __init__(self):
+        """ Initiliaze
+        """
+        self.now = 0
+
+    def __call__(self):
+        """ Current time
+        """
+        return self.now
+
+    def tick(self, seconds):
+        """ Move the time forward
+        """
+        self.now += seconds
+
+
+clock = Clock()
+my_cache = LRUCache(clock=clock, default_ttl=10)
+my_cache.put("A", "Hello")
+my_cache.put("B", "World", ttl=5)
+my_cache.put("C", "ALX", ttl=20)
+clock.tick(5)
+# Expires lazily on access, at its deadline
+print(my_cache.get("B"))
+print(my_cache.get("A"))
+my_cache.print_cache()
+print(my_cache.stats())
+
+# Pops the due entries only
+my_cache.put("D", "School", ttl=1)
+clock.tick(5)
+my_cache.expire()
+my_cache.print_cache()
+print(my_cache.stats()["expirations"])
+
+# Expired entries make room without being evicted: no DISCARD
+my_cache.put("E", "Battery", ttl=1)
+my_cache.put("F", "Mission")
+my_cache.put("G", "San Francisco")
+my_cache.print_cache()
+clock.tick(1)
+my_cache.put("H", "H")
+my_cache.print_cache()
+print(my_cache.stats())
+
+# One more than fits: DISCARD of the least recently used
+my_cache.put("I", "I")
+my_cache.print_cache()
+print(my_cache.stats())
+
+# Updating a key replaces its deadline, and stale heap entries are
+# dropped rather than piling up
+my_cache.put("I", "I", ttl=1000)
+for i in range(1000):
+    my_cache.put("H", i)
+print(len(my_cache.expiry_heap) <= 2 * len(my_cache.deadlines) + 64)
+clock.tick(10)
+my_cache.expire()
+my_cache.print_cache()
+print(my_cache.stats()["expirations"])
+
+# A ttl of 0 is never stored, and drops a stale value
+my_cache.put("I", "New", ttl=0)
+print(my_cache.get("I"))
@@ -1,18 +1,185 @@
 #!/usr/bin/python3
 """ BaseCaching module
 """
+import heapq
+import sys
+import threading
+import time
+
+
+def deep_sizeof(obj, seen=None):
+    """ Approximate size in bytes of obj and everything it references
+        through containers and instance attributes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            size += deep_sizeof(value, seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def print_discard(key, item):
+    """ Default eviction hook, announcing the discarded key
+    """
+    print("DISCARD: {}".format(key))
+
+
+class LatencyHistogram():
+    """ LatencyHistogram defines:
+      - a count of latencies per power-of-two nanosecond bucket
+    """
+
+    def __init__(self):
+        """ Initiliaze
+        """
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+
+    def record(self, ns):
+        """ Add one latency measured in nanoseconds
+        """
+        self.buckets[min(ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total_ns += ns
+
+    def merge(self, other):
+        """ Add the latencies recorded by other
+        """
+        for i, count in enumerate(other.buckets):
+            self.buckets[i] += count
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def percentile(self, p):
+        """ Upper bound in ns of the bucket holding the p-th percentile
+        """
+        rank = p / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return (1 << i) - 1
+        return 0
+
+    def as_dict(self):
+        """ Summary of the recorded latencies
+        """
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns / self.count if self.count else 0,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+        }
+
+
+class CacheStats():
+    """ CacheStats defines:
+      - hit, miss and put counters of a cache
+      - optional get and put latency histograms
+    """
+
+    def __init__(self, latency=False):
+        """ Initiliaze
+        """
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.get_latency = LatencyHistogram() if latency else None
+        self.put_latency = LatencyHistogram() if latency else None
+
+    def merge(self, other):
+        """ Add the counts recorded by other
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+        self.puts += other.puts
+        if other.get_latency is not None:
+            if self.get_latency is None:
+                self.get_latency = LatencyHistogram()
+                self.put_latency = LatencyHistogram()
+            self.get_latency.merge(other.get_latency)
+            self.put_latency.merge(other.put_latency)
+
+    def as_dict(self):
+        """ Summary of the counters and latencies
+        """
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "puts": self.puts,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+        if self.get_latency is not None:
+            stats["get_latency"] = self.get_latency.as_dict()
+            stats["put_latency"] = self.put_latency.as_dict()
+        return stats
+
 
 class BaseCaching():
     """ BaseCaching defines:
       - constants of your caching system
       - where your data are stored (in a dictionary)
+      - the capacity of an instance, as an item count (max_items)
+        and/or approximate bytes (max_bytes, measured with sizer),
+        MAX_ITEMS items when neither is given
+      - optional time-to-live of entries, per put or default_ttl,
+        measured in seconds of clock
+      - optional statistics (stats, latency) and the on_evict hook
+        called with each discarded key and item
+
+    Subclasses implement their policy through the hooks _on_admit,
+    _on_insert, _on_update, _on_access, _on_remove and _victim.
     """
     MAX_ITEMS = 4
+    # put_many may evict in one pass before inserting a batch of new
+    # keys: true when victims are always the oldest insertions/uses
+    BATCH_EVICTION = False
 
-    def __init__(self):
+    def __init__(self, max_items=None, max_bytes=None, sizer=None,
+                 default_ttl=None, clock=time.monotonic, stats=False,
+                 latency=False, on_evict=print_discard):
         """ Initiliaze
         """
         self.cache_data = {}
+        if max_items is None and max_bytes is None:
+            max_items = self.MAX_ITEMS
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizer = deep_sizeof if sizer is None else sizer
+        self.track_bytes = max_bytes is not None or sizer is not None
+        self.sizes = {}
+        self.current_bytes = 0
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.deadlines = {}  # key -> its live expiry_heap entry
+        self.expiry_heap = []  # (deadline, seq, key), may hold stale ones
+        self.expiry_seq = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.on_evict = on_evict
+        self.counters = None
+        if stats or latency:
+            # Only instrumented instances pay for counting and timing
+            self.counters = CacheStats(latency)
+            self.get = self._counted_get
+            self.put = self._counted_put
+            self.get_many = self._counted_get_many
+            self.put_many = self._counted_put_many
 
     def print_cache(self):
         """ Print the cache
@@ -21,12 +188,473 @@ class BaseCaching():
         for key in sorted(self.cache_data.keys()):
             print("{}: {}".format(key, self.cache_data.get(key)))
 
-    def put(self, key, item):
-        """ Add an item in the cache
+    def put(self, key, item, ttl=None):
+        """ Add an item in the cache, expiring after ttl seconds
+            (default_ttl when None)
         """
-        raise NotImplementedError("put must be implemented in your cache class")
+        if key is None or item is None:
+            return
+        if self.expiry_heap:
+            self.expire()
+        if ttl is None:
+            ttl = self.default_ttl
+        size = self.sizer(item) if self.track_bytes else 0
+        if ((self.max_bytes is not None and size > self.max_bytes) or
+                (ttl is not None and ttl <= 0)):
+            # Can never be served: drop any stale value rather than
+            # flush the others
+            if key in self.cache_data:
+                self._remove(key)
+            return
+
+        if key in self.cache_data:
+            old = self.sizes.get(key, 0)
+            if (self.max_bytes is None or
+                    self.current_bytes - old + size <= self.max_bytes):
+                if self.track_bytes:
+                    self.sizes[key] = size
+                    self.current_bytes += size - old
+                self.cache_data[key] = item
+                self._set_deadline(key, ttl)
+                self._on_update(key)
+                return
+            # The new value no longer fits beside the others, so it is
+            # stored again as a fresh entry after making room
+            self._remove(key)
+
+        self._on_admit(key)
+        self._make_room(1, size)
+        self.cache_data[key] = item
+        if self.track_bytes:
+            self.sizes[key] = size
+            self.current_bytes += size
+        self._set_deadline(key, ttl)
+        self._on_insert(key)
 
     def get(self, key):
         """ Get an item by key
         """
-        raise NotImplementedError("get must be implemented in your cache class")
+        if key is None or key not in self.cache_data:
+            return None
+        entry = self.deadlines.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            self._expire(key)
+            return None
+        self._on_access(key)
+        return self.cache_data[key]
+
+    def delete(self, key):
+        """ Remove key without counting an eviction
+
+        Returns:
+            The removed item, or None if key was not cached.
+        """
+        if key not in self.cache_data:
+            return None
+        return self._remove(key)
+
+    def get_many(self, keys):
+        """ Get the items of several keys at once
+
+        Returns:
+            dict: key -> item for the keys found in the cache
+        """
+        found = {}
+        cache_data = self.cache_data
+        deadlines = self.deadlines
+        now = self.clock() if deadlines else None
+        on_access = self._on_access
+        for key in keys:
+            if key not in cache_data:
+                continue
+            if deadlines:
+                entry = deadlines.get(key)
+                if entry is not None and entry[0] <= now:
+                    self._expire(key)
+                    continue
+            on_access(key)
+            found[key] = cache_data[key]
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items at once, with the same outcome as putting
+            them one by one in order
+        """
+        if self.expiry_heap:
+            self.expire()
+        items = [(key, item) for key, item in mapping.items()
+                 if key is not None and item is not None]
+        if ttl is None:
+            ttl = self.default_ttl
+        if self.track_bytes or (ttl is not None and ttl <= 0):
+            put = type(self).put
+            for key, item in items:
+                put(self, key, item, ttl)
+        elif (self.BATCH_EVICTION and
+              not any(key in self.cache_data for key, _ in items)):
+            self._put_new_many(items, ttl)
+        else:
+            self._put_counted_many(items, ttl)
+
+    def expire(self):
+        """ Remove every expired entry, in O(expired) heap pops
+        """
+        heap = self.expiry_heap
+        now = self.clock()
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self.deadlines.get(entry[2]) is entry:
+                self._expire(entry[2])
+
+    def stats(self):
+        """ Snapshot of the cache statistics
+        """
+        stats = {
+            "policy": type(self).__name__,
+            "size": len(self.cache_data),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+        if self.counters is not None:
+            stats.update(self.counters.as_dict())
+        return stats
+
+    def usage(self):
+        """ Current and maximum capacity usage of the cache
+        """
+        if self.track_bytes:
+            used = self.current_bytes
+        else:
+            used = sum(self.sizer(item) for item in self.cache_data.values())
+        return {
+            "items": len(self.cache_data),
+            "bytes": used,
+            "max_items": self.max_items,
+            "max_bytes": self.max_bytes,
+        }
+
+    @classmethod
+    def sharded(cls, shards=None, **kwargs):
+        """ Build a thread-safe, lock-striped cache using this policy
+            (see ShardedCache for the default number of shards)
+        """
+        return ShardedCache(cls, shards, **kwargs)
+
+    def _is_over(self, items, nbytes):
+        """ Whether adding items entries of nbytes would exceed capacity
+        """
+        if (self.max_items is not None and
+                len(self.cache_data) + items > self.max_items):
+            return True
+        return (self.max_bytes is not None and
+                self.current_bytes + nbytes > self.max_bytes)
+
+    def _make_room(self, items, nbytes):
+        """ Evict policy victims until items entries of nbytes fit
+        """
+        while self.cache_data and self._is_over(items, nbytes):
+            self._discard(self._victim())
+
+    def _discard(self, key):
+        """ Evict key to free capacity
+        """
+        item = self._remove(key)
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, item)
+
+    def _put_counted_many(self, items, ttl):
+        """ put() of every item inlined, for caches bounded by count
+        """
+        cache_data = self.cache_data
+        deadlines = self.deadlines
+        max_items = self.max_items
+        on_admit = self._on_admit
+        on_insert = self._on_insert
+        on_update = self._on_update
+        discard = self._discard
+        victim = self._victim
+        for key, item in items:
+            if key in cache_data:
+                cache_data[key] = item
+                if ttl is not None:
+                    self._set_deadline(key, ttl)
+                elif deadlines:
+                    deadlines.pop(key, None)
+                on_update(key)
+                continue
+            on_admit(key)
+            if max_items is not None:
+                while cache_data and len(cache_data) >= max_items:
+                    discard(victim())
+            cache_data[key] = item
+            if ttl is not None:
+                self._set_deadline(key, ttl)
+            on_insert(key)
+
+    def _put_new_many(self, items, ttl):
+        """ Insert keys absent from the cache after a single eviction
+            pass, for policies evicting their oldest entries first
+        """
+        overflow = []
+        if self.max_items is not None and len(items) > self.max_items:
+            # Put one by one, these would be evicted by the batch itself
+            cut = len(items) - self.max_items
+            overflow, items = items[:cut], items[cut:]
+        self._make_room(len(items) + len(overflow), 0)
+        for key, item in overflow:
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, item)
+        cache_data = self.cache_data
+        on_insert = self._on_insert
+        for key, item in items:
+            self._on_admit(key)
+            cache_data[key] = item
+            if self.track_bytes:
+                size = self.sizer(item)
+                self.sizes[key] = size
+                self.current_bytes += size
+            if ttl is not None:
+                self._set_deadline(key, ttl)
+            on_insert(key)
+
+    def _counted_get(self, key):
+        """ get() recording a hit or miss and optionally its latency
+        """
+        counters = self.counters
+        if counters.get_latency is None:
+            item = type(self).get(self, key)
+        else:
+            start = time.perf_counter_ns()
+            item = type(self).get(self, key)
+            counters.get_latency.record(time.perf_counter_ns() - start)
+        if item is None:
+            counters.misses += 1
+        else:
+            counters.hits += 1
+        return item
+
+    def _counted_get_many(self, keys):
+        """ get_many() recording its hits and misses
+        """
+        keys = list(keys)
+        found = type(self).get_many(self, keys)
+        self.counters.hits += len(found)
+        self.counters.misses += len(keys) - len(found)
+        return found
+
+    def _counted_put_many(self, mapping, ttl=None):
+        """ put_many() recording its puts
+        """
+        self.counters.puts += len(mapping)
+        type(self).put_many(self, mapping, ttl)
+
+    def _counted_put(self, key, item, ttl=None):
+        """ put() recording the call and optionally its latency
+        """
+        counters = self.counters
+        counters.puts += 1
+        if counters.put_latency is None:
+            type(self).put(self, key, item, ttl)
+        else:
+            start = time.perf_counter_ns()
+            type(self).put(self, key, item, ttl)
+            counters.put_latency.record(time.perf_counter_ns() - start)
+
+    def _expire(self, key):
+        """ Remove key because its time-to-live elapsed
+        """
+        self._remove(key)
+        self.expirations += 1
+
+    def _remove(self, key):
+        """ Remove key from the cache and the policy bookkeeping
+        """
+        item = self.cache_data.pop(key)
+        self.current_bytes -= self.sizes.pop(key, 0)
+        self.deadlines.pop(key, None)
+        self._on_remove(key)
+        return item
+
+    def _set_deadline(self, key, ttl):
+        """ Schedule the expiry of key ttl seconds from now, if any
+        """
+        if ttl is None:
+            self.deadlines.pop(key, None)
+            return
+        self.expiry_seq += 1
+        entry = (self.clock() + ttl, self.expiry_seq, key)
+        self.deadlines[key] = entry
+        heapq.heappush(self.expiry_heap, entry)
+        if len(self.expiry_heap) > 2 * len(self.deadlines) + 64:
+            # Rebuild without the entries made stale by updates/removals
+            self.expiry_heap = [entry for entry in self.expiry_heap
+                                if self.deadlines.get(entry[2]) is entry]
+            heapq.heapify(self.expiry_heap)
+
+    def _on_admit(self, key):
+        """ Policy hook: key is about to be added, before making room
+        """
+
+    def _on_insert(self, key):
+        """ Policy hook: key was just added
+        """
+
+    def _on_update(self, key):
+        """ Policy hook: the item of an existing key was replaced
+        """
+        self._on_access(key)
+
+    def _on_access(self, key):
+        """ Policy hook: key was read
+        """
+
+    def _on_remove(self, key):
+        """ Policy hook: key left the cache
+        """
+
+    def _victim(self):
+        """ Policy hook: key to evict next, the oldest one by default
+        """
+        return next(iter(self.cache_data))
+
+
+def split_capacity(capacity, shards):
+    """ Shares of capacity for each shard, adding up to capacity
+    """
+    if capacity is None:
+        return [None] * shards
+    share, remainder = divmod(capacity, shards)
+    return [share + (index < remainder) for index in range(shards)]
+
+
+class ShardedCache(BaseCaching):
+    """ ShardedCache defines:
+      - a thread-safe cache split into independent shards
+      - one lock and one policy instance per shard, each shard
+        evicting on its own once it holds its share of the capacity,
+        the shares adding up to the configured capacity
+    """
+    SHARDS = 8
+
+    def __init__(self, cache_class, shards=None, max_items=None,
+                 max_bytes=None, **kwargs):
+        """ Initiliaze `shards` instances of `cache_class`, SHARDS
+            by default, or one per item if max_items is smaller
+        """
+        if max_items is None and max_bytes is None:
+            max_items = cache_class.MAX_ITEMS
+        if shards is None:
+            shards = self.SHARDS
+            if max_items is not None:
+                shards = max(1, min(shards, max_items))
+        if shards < 1:
+            raise ValueError("shards must be a positive integer")
+        if max_items is not None and shards > max_items:
+            raise ValueError("more shards than max_items")
+        self.cache_class = cache_class
+        self.shards = [cache_class(max_items=items, max_bytes=nbytes,
+                                   **kwargs)
+                       for items, nbytes in zip(
+                           split_capacity(max_items, shards),
+                           split_capacity(max_bytes, shards))]
+        self.locks = [threading.Lock() for _ in range(shards)]
+
+    @property
+    def cache_data(self):
+        """ Snapshot of every shard's entries merged in one dictionary
+        """
+        merged = {}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                merged.update(shard.cache_data)
+        return merged
+
+    def put(self, key, item, ttl=None):
+        """ Add an item in the shard owning key
+        """
+        index = hash(key) % len(self.shards)
+        with self.locks[index]:
+            self.shards[index].put(key, item, ttl)
+
+    def get(self, key):
+        """ Get an item by key from the shard owning it
+        """
+        index = hash(key) % len(self.shards)
+        with self.locks[index]:
+            return self.shards[index].get(key)
+
+    def delete(self, key):
+        """ Remove key from the shard owning it
+        """
+        index = hash(key) % len(self.shards)
+        with self.locks[index]:
+            return self.shards[index].delete(key)
+
+    def get_many(self, keys):
+        """ Get several keys, locking each shard involved once
+        """
+        found = {}
+        for index, batch in self._by_shard(keys).items():
+            with self.locks[index]:
+                found.update(self.shards[index].get_many(batch))
+        return found
+
+    def put_many(self, mapping, ttl=None):
+        """ Add several items, locking each shard involved once
+        """
+        for index, batch in self._by_shard(mapping).items():
+            with self.locks[index]:
+                self.shards[index].put_many(
+                    {key: mapping[key] for key in batch}, ttl)
+
+    def _by_shard(self, keys):
+        """ Group keys by the index of the shard owning them
+        """
+        groups = {}
+        count = len(self.shards)
+        for key in keys:
+            groups.setdefault(hash(key) % count, []).append(key)
+        return groups
+
+    def expire(self):
+        """ Remove every expired entry from every shard
+        """
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.expire()
+
+    def stats(self):
+        """ Statistics summed over every shard
+        """
+        counters = None
+        total = {"policy": self.cache_class.__name__, "shards": 0,
+                 "size": 0, "evictions": 0, "expirations": 0}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                total["shards"] += 1
+                total["size"] += len(shard.cache_data)
+                total["evictions"] += shard.evictions
+                total["expirations"] += shard.expirations
+                if shard.counters is not None:
+                    if counters is None:
+                        counters = CacheStats()
+                    counters.merge(shard.counters)
+        if counters is not None:
+            total.update(counters.as_dict())
+        return total
+
+    def usage(self):
+        """ Capacity usage summed over every shard
+        """
+        total = {"items": 0, "bytes": 0, "max_items": 0, "max_bytes": 0}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                usage = shard.usage()
+            for name, value in usage.items():
+                if value is None or total[name] is None:
+                    total[name] = None
+                else:
+                    total[name] += value
+        return total
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+""" get_many/put_many against per-key get/put loops, per policy
+
+Usage: ./benchmark_batch.py [batches] [batch_size]
+"""
+
+import random
+import sys
+import time
+
+from cache_simulator import POLICIES
+
+CAPACITY = 10000
+
+
+def run(cache, batches, looped):
+    """ Seconds taken to put then get every batch
+    """
+    start = time.perf_counter()
+    for batch in batches:
+        if looped:
+            for key, item in batch.items():
+                cache.put(key, item)
+            for key in batch:
+                cache.get(key)
+        else:
+            cache.put_many(batch)
+            cache.get_many(batch)
+    return time.perf_counter() - start
+
+
+def bench(make_cache, batches):
+    """ Returns (looped seconds, batched seconds)
+    """
+    return run(make_cache(), batches, True), run(make_cache(), batches, False)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(0)
+    batches = [{rng.randrange(3 * CAPACITY): i for _ in range(size)}
+               for i in range(count)]
+    setups = {
+        "plain": {},
+        "ttl+stats": {"default_ttl": 60, "stats": True},
+    }
+    print("{:>8} {:>10} {:>10} {:>10} {:>8}".format(
+        "policy", "setup", "loop ms", "batch ms", "speedup"))
+    for name, cache_class in POLICIES.items():
+        for setup, kwargs in setups.items():
+            looped, batched = bench(
+                lambda: cache_class(max_items=CAPACITY, on_evict=None,
+                                    **kwargs), batches)
+            print("{:>8} {:>10} {:>10.1f} {:>10.1f} {:>7.2f}x".format(
+                name, setup, looped * 1e3, batched * 1e3, looped / batched))
+    looped, batched = bench(
+        lambda: POLICIES["lru"].sharded(8, max_items=CAPACITY,
+                                        on_evict=None), batches)
+    print("{:>8} {:>10} {:>10.1f} {:>10.1f} {:>7.2f}x".format(
+        "lru", "8 shards", looped * 1e3, batched * 1e3, looped / batched))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+""" Stress benchmark: bucketed LFUCache against the previous
+    scan-based implementation
+
+Usage: ./benchmark_lfu.py [ops]
+"""
+
+import contextlib
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+from base_caching import BaseCaching
+LFUCache = __import__('100-lfu_cache').LFUCache
+
+SIZES = (10 ** 2, 10 ** 3, 10 ** 4)
+
+
+class ScanLFUCache(BaseCaching):
+    """ The former LFUCache: min() over every frequency and a second
+        min() over last-use times on each eviction.
+    """
+
+    def __init__(self, **kwargs):
+        """ Initialize the ScanLFUCache
+        """
+        super().__init__(**kwargs)
+        self.frequency = defaultdict(int)
+        self.key_to_time = {}
+
+    def put(self, key, item):
+        """ Add an item in the cache
+        """
+        if key is None or item is None:
+            return
+        if len(self.cache_data) >= self.max_items:
+            min_freq = min(self.frequency.values(), default=None)
+            lfu_keys = [k for k, v in self.frequency.items() if v == min_freq]
+            lfu_key = min(lfu_keys, key=lambda k: self.key_to_time[k])
+            del self.cache_data[lfu_key]
+            del self.frequency[lfu_key]
+            del self.key_to_time[lfu_key]
+            print(f"DISCARD: {lfu_key}")
+        self.cache_data[key] = item
+        self.frequency[key] = 1
+        self.key_to_time[key] = len(self.key_to_time)
+
+    def get(self, key):
+        """ Get an item by key
+        """
+        if key is None or key not in self.cache_data:
+            return None
+        self.frequency[key] += 1
+        self.key_to_time[key] = len(self.key_to_time)
+        return self.cache_data[key]
+
+
+def workload(size, ops):
+    """ Skewed key stream over twice the cache size so roughly half of
+        the lookups miss and evict.
+    """
+    rng = random.Random(size)
+    universe = 2 * size
+    return [int(universe * rng.random() ** 2) for _ in range(ops)]
+
+
+def bench(cache_class, size, keys):
+    """ Replay `keys` as get-then-put-on-miss. Returns (ns/op, hit ratio).
+    """
+    cache = cache_class(max_items=size, on_evict=None)
+    for i in range(size):
+        cache.put(i, i)
+    hits = 0
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for key in keys:
+                if cache.get(key) is None:
+                    cache.put(key, key)
+                else:
+                    hits += 1
+            elapsed = time.perf_counter() - start
+    return elapsed / len(keys) * 1e9, hits / len(keys)
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("{:>8} {:>16} {:>16} {:>8}".format("entries", "scan ns/op",
+                                              "bucket ns/op", "speedup"))
+    for size in SIZES:
+        keys = workload(size, ops)
+        scan_ns, _ = bench(ScanLFUCache, size, keys)
+        bucket_ns, _ = bench(LFUCache, size, keys)
+        print("{:>8} {:>16.0f} {:>16.0f} {:>7.1f}x".format(
+            size, scan_ns, bucket_ns, scan_ns / bucket_ns))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+""" Benchmark LRUCache hit and eviction latency against cache size
+
+Usage: ./benchmark_lru.py [ops]
+"""
+
+import random
+import sys
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+
+def bench(size, ops):
+    """ Fill an LRUCache of `size` entries, then time `ops` hits and
+        `ops` evicting puts. Returns (ns per get, ns per put).
+    """
+    cache = LRUCache(max_items=size, on_evict=None)
+    for i in range(size):
+        cache.put(i, i)
+
+    rng = random.Random(size)
+    keys = [rng.randrange(size) for _ in range(ops)]
+    start = time.perf_counter()
+    for key in keys:
+        cache.get(key)
+    get_ns = (time.perf_counter() - start) / ops * 1e9
+
+    start = time.perf_counter()
+    for key in range(size, size + ops):
+        cache.put(key, key)
+    put_ns = (time.perf_counter() - start) / ops * 1e9
+    return get_ns, put_ns
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("{:>10} {:>12} {:>18}".format("entries", "get ns/op",
+                                        "evicting put ns/op"))
+    for size in SIZES:
+        get_ns, put_ns = bench(size, ops)
+        print("{:>10} {:>12.0f} {:>18.0f}".format(size, get_ns, put_ns))
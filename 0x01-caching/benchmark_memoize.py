@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+""" Memoize Server.get_hyper of 0x00-pagination with a cache policy and
+    report the compute time saved
+
+Usage: ./benchmark_memoize.py [requests] [policy]
+"""
+
+import os
+import sys
+import threading
+import time
+
+from cache_simulator import POLICIES, zipf_trace
+from memoize import memoize
+
+PAGINATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              os.pardir, "0x00-pagination")
+sys.path.insert(0, PAGINATION_DIR)
+Server = __import__('2-hypermedia_pagination').Server
+Server.DATA_FILE = os.path.join(PAGINATION_DIR, Server.DATA_FILE)
+
+
+def replay(get_hyper, pages, threads=4):
+    """ Seconds taken by `threads` threads requesting every page
+    """
+    chunks = [pages[i::threads] for i in range(threads)]
+    pool = [threading.Thread(target=lambda c=c: [get_hyper(p, 100)
+                                                 for p in c])
+            for c in chunks]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    policy = sys.argv[2] if len(sys.argv) > 2 else "lru"
+    server = Server()
+    server.dataset()
+    pages = [page + 1 for page in zipf_trace(requests, 195)]
+
+    plain = replay(server.get_hyper, pages)
+    cached = memoize(server.get_hyper,
+                     cache=POLICIES[policy](max_items=64, on_evict=None),
+                     ttl=300)
+    memoized = replay(cached, pages)
+    print("plain get_hyper:    {:.3f}s".format(plain))
+    print("memoized ({}): {:>6.3f}s".format(policy, memoized))
+    for name, value in cached.cache_stats().items():
+        print("  {}: {}".format(name, value))
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+""" Trace-driven hit ratio of every bounded policy on Zipf, scan and
+    loop access patterns
+
+Usage: ./benchmark_policies.py [requests] [capacity]
+"""
+
+import sys
+
+from cache_simulator import (POLICIES, loop_trace, replay, scan_trace,
+                             zipf_trace)
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    capacity = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    traces = {
+        "zipf": zipf_trace(requests, 10 * capacity),
+        "scan": scan_trace(requests, 10 * capacity, 2 * capacity,
+                           5 * capacity),
+        "loop": loop_trace(requests, capacity + capacity // 5),
+    }
+    print("{:>8}".format("policy") +
+          "".join("{:>8}".format(name) for name in traces) +
+          "   (hit ratio, capacity {})".format(capacity))
+    for name, cache_class in POLICIES.items():
+        ratios = [replay(cache_class, capacity, trace)["hit_ratio"]
+                  for trace in traces.values()]
+        print("{:>8}".format(name) +
+              "".join("{:>8.3f}".format(ratio) for ratio in ratios))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+""" Multi-threaded throughput of sharded caches per policy, shard count
+    and thread count
+
+Usage: ./benchmark_sharded.py [ops_per_thread]
+"""
+
+import random
+import sys
+import threading
+import time
+
+POLICIES = {
+    "basic": __import__('0-basic_cache').BasicCache,
+    "fifo": __import__('1-fifo_cache').FIFOCache,
+    "lifo": __import__('2-lifo_cache').LIFOCache,
+    "lru": __import__('3-lru_cache').LRUCache,
+    "mru": __import__('4-mru_cache').MRUCache,
+    "lfu": __import__('100-lfu_cache').LFUCache,
+}
+SHARDS = (1, 4, 16)
+THREADS = (1, 2, 4, 8)
+CAPACITY = 1024
+
+
+def worker(cache, keys, barrier):
+    """ get-then-put-on-miss over keys once every thread is ready
+    """
+    barrier.wait()
+    for key in keys:
+        if cache.get(key) is None:
+            cache.put(key, key)
+
+
+def bench(cache_class, shards, threads, ops):
+    """ Returns the aggregate ops/sec of `threads` threads each running
+        `ops` operations against one sharded cache
+    """
+    cache = cache_class.sharded(shards, max_items=CAPACITY,
+                                on_evict=None)
+    rng = random.Random(shards * 100 + threads)
+    streams = [[rng.randrange(2 * CAPACITY) for _ in range(ops)]
+               for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(cache, keys, barrier))
+            for keys in streams]
+    for thread in pool:
+        thread.start()
+    start = time.perf_counter()
+    barrier.wait()
+    for thread in pool:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    header = "{:>6} {:>6}".format("policy", "shards")
+    header += "".join("{:>12}".format("{} thr".format(t)) for t in THREADS)
+    print(header + "   (ops/sec)")
+    for name, cache_class in POLICIES.items():
+        for shards in SHARDS:
+            rates = [bench(cache_class, shards, t, ops) for t in THREADS]
+            line = "{:>6} {:>6}".format(name, shards)
+            line += "".join("{:>12.0f}".format(r) for r in rates)
+            print(line)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+""" Trace-replay simulator for the caching policies
+
+Replays synthetic (zipf, uniform, scan, loop) or file-based key traces
+as get-then-put-on-miss against any BaseCaching subclass and reports
+hit ratio, throughput, latency percentiles and peak memory, or sweeps
+capacities to print a miss-ratio curve.
+
+Usage examples:
+    ./cache_simulator.py --trace zipf --capacity 1000
+    ./cache_simulator.py --trace scan --policy lru,arc,tinylfu \\
+        --sweep 100,500,1000,5000
+    ./cache_simulator.py --trace-file keys.txt --policy lfu --memory
+"""
+
+import argparse
+import itertools
+import random
+import time
+import tracemalloc
+
+POLICIES = {
+    "fifo": __import__('1-fifo_cache').FIFOCache,
+    "lifo": __import__('2-lifo_cache').LIFOCache,
+    "lru": __import__('3-lru_cache').LRUCache,
+    "mru": __import__('4-mru_cache').MRUCache,
+    "lfu": __import__('100-lfu_cache').LFUCache,
+    "arc": __import__('101-arc_cache').ARCCache,
+    "tinylfu": __import__('102-tinylfu_cache').TinyLFUCache,
+}
+
+
+def zipf_trace(requests, keys, alpha=0.9, seed=0):
+    """ Keys drawn with probability proportional to 1 / rank ** alpha
+    """
+    rng = random.Random(seed)
+    weights = itertools.accumulate(1 / rank ** alpha
+                                   for rank in range(1, keys + 1))
+    return rng.choices(range(keys), cum_weights=list(weights), k=requests)
+
+
+def uniform_trace(requests, keys, seed=0):
+    """ Keys drawn uniformly at random
+    """
+    rng = random.Random(seed)
+    return [rng.randrange(keys) for _ in range(requests)]
+
+
+def scan_trace(requests, keys, scan_length, every, seed=0):
+    """ A Zipf working set interrupted every `every` requests by a
+        sequential scan of scan_length keys that are never seen again
+    """
+    hot = zipf_trace(requests, keys, seed=seed)
+    trace = []
+    scanned = keys
+    for start in range(0, requests, every):
+        trace.extend(hot[start:start + every])
+        trace.extend(range(scanned, scanned + scan_length))
+        scanned += scan_length
+    return trace[:requests]
+
+
+def loop_trace(requests, keys):
+    """ The same keys requested cyclically, in order
+    """
+    return [i % keys for i in range(requests)]
+
+
+def read_trace(path):
+    """ Keys of a trace file: the first field of every non-empty line
+    """
+    with open(path) as f:
+        return [line.split()[0] for line in f if line.strip()]
+
+
+def replay(cache_class, capacity, trace, memory=False, **kwargs):
+    """ Replay trace against a cache of capacity items
+
+    Returns:
+        dict: hit_ratio, ops_per_sec, p50_ns and p99_ns per request,
+        and peak_bytes allocated during a second, traced replay when
+        memory is set.
+    """
+    cache = cache_class(max_items=capacity, on_evict=None, **kwargs)
+    latencies = []
+    hits = 0
+    clock = time.perf_counter_ns
+    started = clock()
+    for key in trace:
+        start = clock()
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+        latencies.append(clock() - start)
+    elapsed = (clock() - started) / 1e9
+    latencies.sort()
+    report = {
+        "hit_ratio": hits / len(trace),
+        "ops_per_sec": len(trace) / elapsed,
+        "p50_ns": latencies[len(latencies) // 2],
+        "p99_ns": latencies[min(len(latencies) - 1,
+                                len(latencies) * 99 // 100)],
+    }
+    if memory:
+        # tracemalloc slows every allocation down, so it gets its own run
+        tracemalloc.start()
+        cache = cache_class(max_items=capacity, on_evict=None, **kwargs)
+        for key in trace:
+            if cache.get(key) is None:
+                cache.put(key, key)
+        report["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return report
+
+
+def sweep(cache_class, capacities, trace, **kwargs):
+    """ Miss ratio of cache_class for every capacity, in order
+    """
+    return [(capacity,
+             1 - replay(cache_class, capacity, trace, **kwargs)["hit_ratio"])
+            for capacity in capacities]
+
+
+def plot_curves(curves, width=50):
+    """ Text rendering of miss-ratio curves {policy: [(capacity, miss)]}
+    """
+    lines = []
+    for name, curve in curves.items():
+        lines.append("{} miss ratio".format(name))
+        for capacity, miss in curve:
+            bar = "#" * round(miss * width)
+            lines.append("{:>10} {:6.3f} {}".format(capacity, miss, bar))
+    return "\n".join(lines)
+
+
+def build_trace(args):
+    """ Trace selected by the command line arguments
+    """
+    if args.trace_file:
+        return read_trace(args.trace_file)
+    if args.trace == "zipf":
+        return zipf_trace(args.requests, args.keys, args.alpha, args.seed)
+    if args.trace == "uniform":
+        return uniform_trace(args.requests, args.keys, args.seed)
+    if args.trace == "scan":
+        return scan_trace(args.requests, args.keys, args.keys // 5,
+                          args.keys // 2, args.seed)
+    return loop_trace(args.requests, args.keys)
+
+
+def main():
+    """ Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policy", default=",".join(POLICIES),
+                        help="comma-separated policies to compare")
+    parser.add_argument("--trace", default="zipf",
+                        choices=("zipf", "uniform", "scan", "loop"))
+    parser.add_argument("--trace-file", help="replay keys from a file")
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--alpha", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--sweep", help="comma-separated capacities")
+    parser.add_argument("--memory", action="store_true",
+                        help="also measure peak memory (slower)")
+    args = parser.parse_args()
+
+    trace = build_trace(args)
+    policies = args.policy.split(",")
+    if args.sweep:
+        capacities = [int(c) for c in args.sweep.split(",")]
+        print(plot_curves({name: sweep(POLICIES[name], capacities, trace)
+                           for name in policies}))
+        return
+    print("{:>8} {:>9} {:>11} {:>8} {:>8} {:>12}".format(
+        "policy", "hit ratio", "ops/sec", "p50 ns", "p99 ns", "peak bytes"))
+    for name in policies:
+        report = replay(POLICIES[name], args.capacity, trace, args.memory)
+        print("{:>8} {:>9.3f} {:>11.0f} {:>8} {:>8} {:>12}".format(
+            name, report["hit_ratio"], report["ops_per_sec"],
+            report["p50_ns"], report["p99_ns"],
+            report.get("peak_bytes", "-")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+""" memoize-main: single-flight calls, errors, ttl and unhashable keys """
+import threading
+import time
+
+from memoize import memoize
+
+LRUCache = __import__('3-lru_cache').LRUCache
+THREADS = 8
+
+calls = []
+release = threading.Event()
+
+
+@memoize
+def slow_square(x):
+    """ Square of x, once release is set
+    """
+    calls.append(x)
+    release.wait()
+    time.sleep(0.01)
+    return x * x
+
+
+def run_threads(func, *args):
+    """ Call func(*args) from THREADS threads at once, until every
+        caller but the first waits on its computation
+    """
+    results = [None] * THREADS
+
+    def call(i):
+        try:
+            results[i] = func(*args)
+        except Exception as error:
+            results[i] = error
+
+    threads = [threading.Thread(target=call, args=(i,))
+               for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    while func.cache_stats()["shared"] < THREADS - 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+# Computed once, its result handed to every concurrent caller
+print(run_threads(slow_square, 12))
+print(calls)
+stats = slow_square.cache_stats()
+assert calls == [12]
+assert stats["misses"] == 1 and stats["shared"] == THREADS - 1
+assert stats["saved_seconds"] > 0
+print(stats["misses"], stats["shared"], stats["hits"])
+print(slow_square(12), slow_square.cache_stats()["hits"])
+
+# An error reaches every caller waiting on the computation, and is not
+# cached
+attempts = []
+release.clear()
+
+
+@memoize
+def failing(x):
+    """ Raises, once release is set
+    """
+    attempts.append(x)
+    release.wait()
+    raise ValueError("no result for {}".format(x))
+
+
+results = run_threads(failing, 3)
+assert all(isinstance(result, ValueError) for result in results)
+print([type(result).__name__ for result in results])
+print(results[0], len(attempts))
+try:
+    failing(3)
+except ValueError as error:
+    print(error, len(attempts))
+
+# A callable ttl sets the lifetime of each result from the result
+now = [0]
+cache = LRUCache(clock=lambda: now[0], on_evict=None)
+lifetime = memoize(cache=cache, ttl=lambda result: result)(lambda x: x)
+print(lifetime(5), lifetime(50), lifetime.cache_stats()["misses"])
+now[0] = 10
+print(lifetime(5), lifetime(50), lifetime.cache_stats()["misses"])
+
+# Unhashable arguments are refused rather than keyed by a stand-in
+try:
+    slow_square([1])
+    raise AssertionError("unhashable arguments were memoized")
+except TypeError as error:
+    print(error)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+""" memoize module
+"""
+
+import functools
+import threading
+import time
+
+LRUCache = __import__('3-lru_cache').LRUCache
+
+
+def make_key(args, kwargs):
+    """ Hashable cache key of a call's arguments
+
+    Raises:
+        TypeError: if an argument is unhashable. Pass key= to memoize
+            a function taking lists, dicts... with a key of your own,
+            since no generic stand-in (such as repr) tells all their
+            values apart.
+    """
+    key = args
+    if kwargs:
+        key += (object,) + tuple(sorted(kwargs.items()))
+    try:
+        hash(key)
+    except TypeError as error:
+        raise TypeError("unhashable arguments, memoize with an explicit "
+                        "key=: {}".format(error)) from None
+    return key
+
+
+class Flight():
+    """ Flight class
+        A call being computed, which concurrent identical calls wait on.
+    """
+
+    def __init__(self):
+        """ Initialize the Flight
+        """
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.elapsed = 0.0
+
+
+class Memoized():
+    """ Memoized class
+        Callable wrapping a function whose results are kept in a
+        BaseCaching policy. Concurrent calls with the same arguments
+        share a single computation (single-flight).
+    """
+
+    def __init__(self, func, cache=None, ttl=None, key=make_key):
+        """ Initialize the Memoized wrapper
+
+        Args:
+            func: the function to memoize.
+            cache: BaseCaching instance storing results, an LRUCache
+                of 128 entries by default.
+            ttl: seconds a result stays valid, or a callable computing
+                them from the result; None keeps results until evicted.
+            key: function of (args, kwargs) returning the cache key.
+        """
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.cache = (LRUCache(max_items=128, on_evict=None)
+                      if cache is None else cache)
+        self.ttl = ttl
+        self.key = key
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # Calls served by another caller's computation
+        self.compute_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def __call__(self, *args, **kwargs):
+        """ Cached result of func(*args, **kwargs)
+        """
+        key = self.key(args, kwargs)
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                # Entries are (result, seconds it took to compute)
+                self.hits += 1
+                self.saved_seconds += entry[1]
+                return entry[0]
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            with self.lock:
+                self.saved_seconds += flight.elapsed
+            return flight.result
+
+        start = time.perf_counter()
+        try:
+            flight.result = self.func(*args, **kwargs)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                del self.flights[key]
+                self.compute_seconds += elapsed
+                if flight.error is None:
+                    ttl = self.ttl
+                    if callable(ttl):
+                        ttl = ttl(flight.result)
+                    self.cache.put(key, (flight.result, elapsed), ttl)
+            flight.elapsed = elapsed
+            flight.done.set()
+        return flight.result
+
+    def __get__(self, instance, owner):
+        """ Bind to instance when used on a method
+        """
+        if instance is None:
+            return self
+        return functools.partial(self, instance)
+
+    def cache_clear(self):
+        """ Forget every cached result
+        """
+        with self.lock:
+            for key in list(self.cache.cache_data):
+                self.cache.delete(key)
+
+    def cache_stats(self):
+        """ Hits, misses and the compute time saved by the cache
+        """
+        with self.lock:
+            calls = self.hits + self.misses + self.shared
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "hit_ratio": (self.hits + self.shared) / calls if calls else 0,
+                "compute_seconds": self.compute_seconds,
+                "saved_seconds": self.saved_seconds,
+            }
+
+
+def memoize(func=None, cache=None, ttl=None, key=make_key):
+    """ Decorator memoizing func in a BaseCaching policy, usable bare
+        (@memoize) or configured (@memoize(cache=ARCCache(), ttl=60))
+    """
+    if func is None:
+        return functools.partial(memoize, cache=cache, ttl=ttl, key=key)
+    return Memoized(func, cache, ttl, key)
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+""" put_many-main: put_many against putting the items one by one """
+import random
+
+POLICIES = [
+    __import__('0-basic_cache').BasicCache,
+    __import__('1-fifo_cache').FIFOCache,
+    __import__('2-lifo_cache').LIFOCache,
+    __import__('3-lru_cache').LRUCache,
+    __import__('4-mru_cache').MRUCache,
+    __import__('100-lfu_cache').LFUCache,
+    __import__('101-arc_cache').ARCCache,
+    __import__('102-tinylfu_cache').TinyLFUCache,
+]
+
+
+class Clock():
+    """ Clock defines:
+      - the time in seconds, advanced by calling tick
+    """
+
+    def __init__(self):
+        """ Initiliaze
+        """
+        self.now = 0
+
+    def __call__(self):
+        """ Current time
+        """
+        return self.now
+
+    def tick(self, seconds):
+        """ Move the time forward
+        """
+        self.now += seconds
+
+
+def twins(policy, **kwargs):
+    """ Two caches of policy sharing a clock, with their evictions
+    """
+    clock = Clock()
+    caches = []
+    for _ in range(2):
+        evicted = []
+        cache = policy(clock=clock, on_evict=lambda key, item, evicted=evicted:
+                       evicted.append((key, item)), **kwargs)
+        caches.append((cache, evicted))
+    return clock, caches
+
+
+rng = random.Random(0)
+for policy in POLICIES:
+    for kwargs in ({}, {"max_items": 5}, {"default_ttl": 3},
+                   {"max_bytes": 600, "sizer": lambda item: 100}):
+        for trace in range(200):
+            clock, ((batched, batch_evicted), (looped, loop_evicted)) = \
+                twins(policy, **kwargs)
+            for step in range(rng.randint(1, 12)):
+                batch = {rng.randrange(12): "{}-{}".format(step, i)
+                         for i in range(rng.randint(0, 12))}
+                if rng.random() < 0.1:
+                    batch[rng.randrange(12)] = None
+                ttl = rng.choice((None, None, 1, 4))
+                batched.put_many(batch, ttl)
+                # Due entries expire first, even for an empty batch
+                looped.expire()
+                for key, item in batch.items():
+                    looped.put(key, item, ttl)
+                assert list(batched.cache_data.items()) == \
+                    list(looped.cache_data.items()), (policy, kwargs, trace)
+                assert batch_evicted == loop_evicted, (policy, kwargs, trace)
+                for key in rng.sample(range(12), 3):
+                    assert batched.get(key) == looped.get(key)
+                clock.tick(rng.randint(0, 2))
+            assert batched.stats() == looped.stats()
+    print("{}: put_many matches put".format(policy.__name__))
+
+# A batch of new keys larger than the cache evicts its own first keys,
+# as putting them one by one would
+LRUCache = __import__('3-lru_cache').LRUCache
+my_cache = LRUCache()
+my_cache.put("A", "Hello")
+my_cache.put_many({key: key.lower() for key in "BCDEFG"})
+my_cache.print_cache()
+print(my_cache.stats())